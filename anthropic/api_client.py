@@ -71,7 +71,7 @@ async def stream_anthropic_response(
     access_token: str,
     client_beta_headers: Optional[str] = None,
     tracer: Optional["StreamTracer"] = None,
-) -> AsyncIterator[str]:
+) -> AsyncIterator[bytes]:
     """Stream response from Anthropic API
 
     Args:
@@ -82,7 +82,7 @@ async def stream_anthropic_response(
         tracer: Optional stream tracer for debugging
 
     Yields:
-        SSE event strings from the Anthropic API
+        Raw SSE bytes from the Anthropic API
     """
     # Inject system message if not present
     if not anthropic_request.get("system"):
@@ -145,7 +145,7 @@ async def stream_anthropic_response(
                     tracer.log_error(f"anthropic error status={response.status_code} body={error_json}")
 
                 # Format error as SSE event for proper client handling
-                error_event = f"event: error\ndata: {error_json}\n\n"
+                error_event = f"event: error\ndata: {error_json}\n\n".encode("utf-8")
                 if tracer:
                     tracer.log_note("yielding synthetic error SSE event (non-200 response)")
                 yield error_event
@@ -154,20 +154,20 @@ async def stream_anthropic_response(
             # Stream successful response chunks
             chunk_index = 0
             try:
-                async for chunk in response.aiter_text():
+                async for chunk in response.aiter_bytes():
                     chunk_index += 1
                     if tracer:
                         tracer.log_note(f"received anthropic chunk #{chunk_index}")
                         tracer.log_source_chunk(chunk)
                     yield chunk
             except httpx.ReadTimeout:
-                error_event = f"event: error\ndata: {{\"error\": \"Stream timeout after {STREAM_TIMEOUT}s\"}}\n\n"
+                error_event = f"event: error\ndata: {{\"error\": \"Stream timeout after {STREAM_TIMEOUT}s\"}}\n\n".encode("utf-8")
                 if tracer:
                     tracer.log_error(f"anthropic stream timeout after {STREAM_TIMEOUT}s")
                     tracer.log_note("yielding timeout SSE event")
                 yield error_event
             except httpx.RemoteProtocolError as e:
-                error_event = f"event: error\ndata: {{\"error\": \"Connection closed: {str(e)}\"}}\n\n"
+                error_event = f"event: error\ndata: {{\"error\": \"Connection closed: {str(e)}\"}}\n\n".encode("utf-8")
                 if tracer:
                     tracer.log_error(f"anthropic stream closed unexpectedly: {str(e)}")
                     tracer.log_note("yielding remote protocol error SSE event")
@@ -1,5 +1,6 @@
 """Model name resolution and legacy parsing"""
 
+from functools import lru_cache
 from typing import Optional, Tuple
 import logging
 
@@ -9,9 +10,14 @@ from .reasoning import REASONING_BUDGET_MAP
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
 def _parse_legacy_model_name(model_name: str) -> Tuple[str, Optional[str], bool]:
     """
     Parse legacy Anthropic model names with -1m / -reasoning suffixes.
+
+    Memoized: the result depends only on the name, and clients reuse a
+    handful of names. Registry lookups stay uncached since custom models
+    can be registered after startup.
     """
     use_1m_context = False
     reasoning_level: Optional[str] = None
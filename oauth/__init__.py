@@ -22,6 +22,8 @@ class OAuthManager:
     - Token validation and retrieval
     """
 
+    __slots__ = ("storage", "pkce", "auth_builder")
+
     def __init__(self):
         self.storage = TokenStorage()
         self.pkce = PKCEManager()
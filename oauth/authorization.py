@@ -1,15 +1,46 @@
 """OAuth authorization URL construction"""
 
 import webbrowser
-from urllib.parse import urlencode
+from urllib.parse import quote_plus
 
 from settings import AUTH_BASE_AUTHORIZE, CLIENT_ID, REDIRECT_URI, SCOPES
 from .pkce import PKCEManager
 
 
+def _build_authorize_template(scope: str) -> str:
+    """Prebuild the authorize URL with only the PKCE values left as placeholders
+
+    The code challenge and state are base64url strings and never need
+    percent-encoding, so they can be substituted directly.
+
+    Args:
+        scope: Space-separated OAuth scopes to request
+
+    Returns:
+        URL template with ``{challenge}`` and ``{state}`` fields
+    """
+    # Parameter order matches the previous urlencode() output
+    return (
+        f"{AUTH_BASE_AUTHORIZE}/oauth/authorize"
+        f"?code=true"  # Critical parameter from OpenCode
+        f"&client_id={quote_plus(CLIENT_ID)}"
+        f"&response_type=code"
+        f"&redirect_uri={quote_plus(REDIRECT_URI)}"
+        f"&scope={quote_plus(scope)}"
+        "&code_challenge={challenge}"
+        "&code_challenge_method=S256"
+        "&state={state}"
+    )
+
+
 class AuthorizationURLBuilder:
     """Builds OAuth authorization URLs with PKCE"""
 
+    # Use claude.ai for authorization (Claude Pro/Max)
+    _AUTH_URL_TEMPLATE = _build_authorize_template(SCOPES)
+    # Minimal scope for long-term tokens
+    _LONG_TERM_AUTH_URL_TEMPLATE = _build_authorize_template("user:inference")
+
     def __init__(self, pkce_manager: PKCEManager):
         self.pkce = pkce_manager
 
@@ -26,19 +57,7 @@ class AuthorizationURLBuilder:
         # Save PKCE values for later use
         self.pkce.save_pkce()
 
-        params = {
-            "code": "true",  # Critical parameter from OpenCode
-            "client_id": CLIENT_ID,
-            "response_type": "code",
-            "redirect_uri": REDIRECT_URI,
-            "scope": SCOPES,
-            "code_challenge": code_challenge,
-            "code_challenge_method": "S256",
-            "state": self.pkce.state
-        }
-
-        # Use claude.ai for authorization (Claude Pro/Max)
-        return f"{AUTH_BASE_AUTHORIZE}/oauth/authorize?{urlencode(params)}"
+        return self._AUTH_URL_TEMPLATE.format(challenge=code_challenge, state=self.pkce.state)
 
     def get_authorize_url_for_long_term_token(self) -> str:
         """Construct OAuth authorize URL for long-term token with minimal scope
@@ -56,19 +75,7 @@ class AuthorizationURLBuilder:
         # Save PKCE values for later use
         self.pkce.save_pkce()
 
-        params = {
-            "code": "true",  # Critical parameter from OpenCode
-            "client_id": CLIENT_ID,
-            "response_type": "code",
-            "redirect_uri": REDIRECT_URI,
-            "scope": "user:inference",  # Minimal scope for long-term tokens
-            "code_challenge": code_challenge,
-            "code_challenge_method": "S256",
-            "state": self.pkce.state
-        }
-
-        # Use claude.ai for authorization (Claude Pro/Max)
-        return f"{AUTH_BASE_AUTHORIZE}/oauth/authorize?{urlencode(params)}"
+        return self._LONG_TERM_AUTH_URL_TEMPLATE.format(challenge=code_challenge, state=self.pkce.state)
 
     def start_login_flow(self) -> str:
         """Start the OAuth login flow by opening browser
@@ -33,11 +33,12 @@ class PKCEManager:
         return code_verifier, code_challenge
 
     def save_pkce(self):
-        """Save PKCE values temporarily to disk"""
-        self.pkce_file.write_text(json.dumps({
-            "code_verifier": self.code_verifier,
-            "state": self.state
-        }))
+        """Save PKCE values temporarily to disk
+
+        Only the verifier is persisted; the state is always the verifier
+        (OpenCode convention) and is reconstructed on load.
+        """
+        self.pkce_file.write_text(json.dumps({"v": self.code_verifier}))
 
     def load_pkce(self) -> Tuple[Optional[str], Optional[str]]:
         """Load saved PKCE values from disk
@@ -48,7 +49,9 @@ class PKCEManager:
         if self.pkce_file.exists():
             try:
                 data = json.loads(self.pkce_file.read_text())
-                return data.get("code_verifier"), data.get("state")
+                # Fall back to the older two-field layout
+                code_verifier = data.get("v") or data.get("code_verifier")
+                return code_verifier, code_verifier
             except (json.JSONDecodeError, IOError):
                 pass
         return None, None
@@ -35,9 +35,8 @@ async def exchange_code(
         Exception: If token exchange fails
     """
     # Split the code and state (they come as "code#state")
-    parts = code.split("#")
-    actual_code = parts[0]
-    state = parts[1] if len(parts) > 1 else None
+    actual_code, _, state_from_code = code.partition("#")
+    state = state_from_code or None
 
     # Load saved PKCE verifier if not already loaded
     if not pkce.code_verifier:
@@ -107,9 +106,8 @@ async def exchange_code_for_long_term_token(
         Exception: If token exchange fails
     """
     # Split the code and state (they come as "code#state")
-    parts = code.split("#")
-    actual_code = parts[0]
-    state = parts[1] if len(parts) > 1 else None
+    actual_code, _, state_from_code = code.partition("#")
+    state = state_from_code or None
 
     # Load saved PKCE verifier if not already loaded
     if not pkce.code_verifier:
@@ -1,5 +1,6 @@
 """OAuth token refresh functionality"""
 
+import asyncio
 import logging
 
 import httpx
@@ -21,12 +22,14 @@ async def refresh_tokens(storage: TokenStorage) -> bool:
     Returns:
         True if refresh succeeded, False otherwise
     """
+    # Read the token file once, off the event loop
+    refresh_token, is_long_term = await asyncio.to_thread(storage.get_refresh_and_status)
+
     # Check if this is a long-term token
-    if storage.is_long_term_token():
+    if is_long_term:
         logger.warning("Cannot refresh long-term tokens - please generate a new token")
         return False
 
-    refresh_token = storage.get_refresh_token()
     if not refresh_token:
         logger.warning("No refresh token available for refresh")
         return False
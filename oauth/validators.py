@@ -2,6 +2,10 @@
 
 import re
 
+# Long-term OAuth tokens start with sk-ant-oat01-
+_LT_PREFIX = "sk-ant-oat01-"
+_LT_TOKEN_RE = re.compile(r'^sk-ant-oat01-[A-Za-z0-9_-]+$')
+
 
 def is_long_term_token_format(token: str) -> bool:
     """Check if a token matches the long-term OAuth token format (sk-ant-oat01-...)
@@ -12,10 +16,7 @@ def is_long_term_token_format(token: str) -> bool:
     Returns:
         True if token matches long-term format, False otherwise
     """
-    if not token:
-        return False
-    # Long-term OAuth tokens start with sk-ant-oat01-
-    return token.startswith("sk-ant-oat01-")
+    return bool(token) and token.startswith(_LT_PREFIX)
 
 
 def validate_token_format(token: str) -> bool:
@@ -32,5 +33,5 @@ def validate_token_format(token: str) -> bool:
     # Check for OAuth token format (sk-ant-oat01-...)
     # Token should be at least 20 characters and contain only valid characters
     if is_long_term_token_format(token):
-        return len(token) > 20 and re.match(r'^sk-ant-oat01-[A-Za-z0-9_-]+$', token) is not None
+        return len(token) > 20 and _LT_TOKEN_RE.match(token) is not None
     return False
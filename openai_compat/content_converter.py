@@ -1,107 +1,159 @@
 """
 Content block conversion between OpenAI and Anthropic formats.
 """
-import json
 import re
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-logger = logging.getLogger(__name__)
+from utils.json_utils import LazyJSON, fast_dumps, EMPTY_DICT
 
+logger = logging.getLogger(__name__)
 
-def convert_openai_content_to_anthropic(openai_content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Convert OpenAI content array to Anthropic content blocks."""
-    anthropic_content = []
+# Media subtype of a base64 image data URI ("png" in data:image/png;base64,...)
+_MEDIA_SUBTYPE_RE = re.compile(r'\w+')
 
-    for item in openai_content:
-        item_type = item.get("type")
 
-        if item_type == "text":
-            anthropic_content.append({
-                "type": "text",
-                "text": item.get("text", "")
-            })
+def _split_image_data_uri(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Split ``data:image/<subtype>;base64,<data>`` into (subtype, data).
 
-        elif item_type == "tool_result":
-            tool_result_content = item.get("content")
-
-            if isinstance(tool_result_content, list):
-                text_parts = []
-                for part in tool_result_content:
-                    if isinstance(part, dict):
-                        part_type = part.get("type")
-                        if part_type == "text":
-                            text_parts.append(part.get("text", ""))
-                        else:
-                            text_parts.append(json.dumps(part))
-                    else:
-                        text_parts.append(str(part))
-                result_content = "\n".join(text_parts)
-            elif isinstance(tool_result_content, str):
-                result_content = tool_result_content
-            elif tool_result_content is None:
-                result_content = ""
+    Only the short header goes through a regex; the payload, which can run to
+    megabytes, is located with str.partition rather than scanned by ``.+``.
+    """
+    if not url.startswith("data:image/"):
+        return None
+    header, sep, payload = url.partition(";base64,")
+    subtype = header[11:]
+    if not sep or not _MEDIA_SUBTYPE_RE.fullmatch(subtype):
+        return None
+    # Like the former '(.+)' capture, stop at the first newline
+    payload = payload.partition("\n")[0]
+    if not payload:
+        return None
+    return subtype, payload
+
+
+def _convert_text_item(item: Dict[str, Any], out: List[Dict[str, Any]]) -> None:
+    """Append an Anthropic text block for an OpenAI text item."""
+    if len(item) == 2 and "text" in item:
+        # Exactly {"type", "text"}: already an Anthropic text block
+        out.append(item)
+        return
+    out.append({
+        "type": "text",
+        "text": item.get("text", "")
+    })
+
+
+def _convert_tool_result_item(item: Dict[str, Any], out: List[Dict[str, Any]]) -> None:
+    """Append an Anthropic tool_result block with its content flattened to text."""
+    tool_result_content = item.get("content")
+
+    if type(tool_result_content) is list:
+        text_parts: List[str] = []
+        append_part = text_parts.append
+        for part in tool_result_content:
+            if type(part) is dict:
+                if part.get("type") == "text":
+                    append_part(part.get("text", ""))
+                else:
+                    append_part(fast_dumps(part))
             else:
-                result_content = json.dumps(tool_result_content)
-
-            tool_result_block = {
-                "type": "tool_result",
-                "tool_use_id": item.get("tool_use_id", ""),
-                "content": result_content
+                append_part(str(part))
+        result_content = "\n".join(text_parts)
+    elif type(tool_result_content) is str:
+        result_content = tool_result_content
+    elif tool_result_content is None:
+        result_content = ""
+    else:
+        result_content = fast_dumps(tool_result_content)
+
+    tool_result_block = {
+        "type": "tool_result",
+        "tool_use_id": item.get("tool_use_id", ""),
+        "content": result_content
+    }
+
+    if "status" in item:
+        tool_result_block["status"] = item["status"]
+    if "is_error" in item:
+        tool_result_block["is_error"] = item["is_error"]
+
+    out.append(tool_result_block)
+
+
+def _convert_tool_use_item(item: Dict[str, Any], out: List[Dict[str, Any]]) -> None:
+    """Append an Anthropic tool_use block, keeping any extra fields of the item."""
+    # Cursor sometimes sends Anthropic-style tool_use blocks directly
+    if "id" in item and "name" in item and "input" in item:
+        # Complete block; extra fields would be copied over unchanged anyway
+        out.append(item)
+        return
+
+    tool_use_block = {
+        "type": "tool_use",
+        "id": item.get("id", ""),
+        "name": item.get("name", ""),
+        "input": item.get("input", {})
+    }
+
+    # Preserve any additional fields if present (e.g., cache_control)
+    for key, value in item.items():
+        if key not in tool_use_block:
+            tool_use_block[key] = value
+
+    out.append(tool_use_block)
+
+
+def _convert_image_url_item(item: Dict[str, Any], out: List[Dict[str, Any]]) -> None:
+    """Append an Anthropic image block for an OpenAI image_url item."""
+    # Convert OpenAI image_url to Anthropic image format
+    image_url = item.get("image_url", EMPTY_DICT)
+    url = image_url.get("url", "") if type(image_url) is dict else image_url
+
+    # Check if it's a base64 data URI or a URL
+    if url.startswith("data:image"):
+        # Extract base64 data and media type
+        parts = _split_image_data_uri(url)
+        if parts:
+            media_type, base64_data = parts
+            out.append({
+                "type": "image",
+                "source": {
+                    "type": "base64",
+                    "media_type": f"image/{media_type}",
+                    "data": base64_data
+                }
+            })
+    else:
+        # Regular URL
+        out.append({
+            "type": "image",
+            "source": {
+                "type": "url",
+                "url": url
             }
+        })
 
-            if "status" in item:
-                tool_result_block["status"] = item["status"]
-            if "is_error" in item:
-                tool_result_block["is_error"] = item["is_error"]
 
-            anthropic_content.append(tool_result_block)
+# OpenAI content item converters keyed by item type; other types are dropped
+_CONTENT_ITEM_CONVERTERS = {
+    "text": _convert_text_item,
+    "tool_result": _convert_tool_result_item,
+    "tool_use": _convert_tool_use_item,
+    "image_url": _convert_image_url_item,
+}
 
-        elif item_type == "tool_use":
-            # Cursor sometimes sends Anthropic-style tool_use blocks directly
-            tool_use_block = {
-                "type": "tool_use",
-                "id": item.get("id", ""),
-                "name": item.get("name", ""),
-                "input": item.get("input", {})
-            }
 
-            # Preserve any additional fields if present (e.g., cache_control)
-            for key, value in item.items():
-                if key not in tool_use_block:
-                    tool_use_block[key] = value
-
-            anthropic_content.append(tool_use_block)
-
-        elif item_type == "image_url":
-            # Convert OpenAI image_url to Anthropic image format
-            image_url = item.get("image_url", {})
-            url = image_url.get("url", "") if isinstance(image_url, dict) else image_url
-
-            # Check if it's a base64 data URI or a URL
-            if url.startswith("data:image"):
-                # Extract base64 data and media type
-                match = re.match(r'data:image/(\w+);base64,(.+)', url)
-                if match:
-                    media_type = match.group(1)
-                    base64_data = match.group(2)
-                    anthropic_content.append({
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": f"image/{media_type}",
-                            "data": base64_data
-                        }
-                    })
-            else:
-                # Regular URL
-                anthropic_content.append({
-                    "type": "image",
-                    "source": {
-                        "type": "url",
-                        "url": url
-                    }
-                })
+def convert_openai_content_to_anthropic(openai_content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert OpenAI content array to Anthropic content blocks."""
+    anthropic_content: List[Dict[str, Any]] = []
+    converter_for = _CONTENT_ITEM_CONVERTERS.get
+
+    for item in openai_content:
+        converter = converter_for(item.get("type"))
+        if converter is not None:
+            converter(item, anthropic_content)
 
     return anthropic_content
 
@@ -118,8 +170,14 @@ def convert_anthropic_content_to_openai(content: List[Dict[str, Any]]) -> tuple[
     Returns:
         tuple: (text_content, tool_calls, reasoning_content, thinking_blocks)
     """
-    logger.debug(f"[RESPONSE_CONVERSION] Converting {len(content)} Anthropic content blocks to OpenAI format")
-    logger.debug(f"[RESPONSE_CONVERSION] Raw Anthropic content: {json.dumps(content, indent=2)}")
+    logger.debug("[RESPONSE_CONVERSION] Converting %s Anthropic content blocks to OpenAI format", len(content))
+    logger.debug("[RESPONSE_CONVERSION] Raw Anthropic content: %s", LazyJSON(content))
+
+    # A lone text block is the most common reply; skip the part lists and joins
+    if len(content) == 1 and content[0].get("type") == "text":
+        text_content = content[0].get("text", "")
+        logger.debug("[RESPONSE_CONVERSION] Single text block: %s...", text_content[:100])
+        return text_content, [], None, []
 
     text_parts = []
     tool_calls = []
@@ -127,40 +185,41 @@ def convert_anthropic_content_to_openai(content: List[Dict[str, Any]]) -> tuple[
     reasoning_parts = []
 
     for idx, block in enumerate(content):
-        block_type = block.get("type")
-        logger.debug(f"[RESPONSE_CONVERSION] Processing block #{idx}: type={block_type}")
+        block_get = block.get
+        block_type = block_get("type")
+        logger.debug("[RESPONSE_CONVERSION] Processing block #%s: type=%s", idx, block_type)
 
         if block_type == "text":
-            text = block.get("text", "")
-            logger.debug(f"[RESPONSE_CONVERSION]   - Text block: {text[:100]}...")
+            text = block_get("text", "")
+            logger.debug("[RESPONSE_CONVERSION]   - Text block: %s...", text[:100])
             text_parts.append(text)
 
         elif block_type == "tool_use":
-            tool_id = block.get("id", "")
-            tool_name = block.get("name", "")
-            tool_input = block.get("input", {})
+            tool_id = block_get("id", "")
+            tool_name = block_get("name", "")
+            tool_input = block_get("input", EMPTY_DICT)
 
             logger.debug("[RESPONSE_CONVERSION]   - Tool use block:")
-            logger.debug(f"[RESPONSE_CONVERSION]     - ID: {tool_id}")
-            logger.debug(f"[RESPONSE_CONVERSION]     - Name: {tool_name}")
-            logger.debug(f"[RESPONSE_CONVERSION]     - Input: {json.dumps(tool_input, indent=2)}")
+            logger.debug("[RESPONSE_CONVERSION]     - ID: %s", tool_id)
+            logger.debug("[RESPONSE_CONVERSION]     - Name: %s", tool_name)
+            logger.debug("[RESPONSE_CONVERSION]     - Input: %s", LazyJSON(tool_input))
 
             openai_tool_call = {
                 "id": tool_id,
                 "type": "function",
                 "function": {
                     "name": tool_name,
-                    "arguments": json.dumps(tool_input)
+                    "arguments": fast_dumps(tool_input)
                 }
             }
 
-            logger.debug(f"[RESPONSE_CONVERSION]     - Converted to OpenAI tool_call: {json.dumps(openai_tool_call, indent=2)}")
+            logger.debug("[RESPONSE_CONVERSION]     - Converted to OpenAI tool_call: %s", LazyJSON(openai_tool_call))
             tool_calls.append(openai_tool_call)
 
-        elif block_type == "thinking" or block.get("thinking") is not None:
+        elif block_type == "thinking" or block_get("thinking") is not None:
             # Extract thinking block (contains reasoning process)
-            thinking_text = block.get("thinking", "")
-            logger.debug(f"[RESPONSE_CONVERSION]   - Thinking block: {thinking_text[:100]}...")
+            thinking_text = block_get("thinking", "")
+            logger.debug("[RESPONSE_CONVERSION]   - Thinking block: %s...", thinking_text[:100])
             thinking_blocks.append(block)
             if thinking_text:
                 reasoning_parts.append(thinking_text)
@@ -177,9 +236,9 @@ def convert_anthropic_content_to_openai(content: List[Dict[str, Any]]) -> tuple[
     thinking_blocks_result = thinking_blocks if thinking_blocks else []
 
     logger.debug("[RESPONSE_CONVERSION] Conversion result:")
-    logger.debug(f"[RESPONSE_CONVERSION]   - Text content: {text_content[:100] if text_content else 'None'}...")
-    logger.debug(f"[RESPONSE_CONVERSION]   - Tool calls: {len(tool_calls_result) if tool_calls_result else 0}")
-    logger.debug(f"[RESPONSE_CONVERSION]   - Reasoning content: {len(reasoning_content) if reasoning_content else 0} chars")
+    logger.debug("[RESPONSE_CONVERSION]   - Text content: %s...", text_content[:100] if text_content else 'None')
+    logger.debug("[RESPONSE_CONVERSION]   - Tool calls: %s", len(tool_calls_result) if tool_calls_result else 0)
+    logger.debug("[RESPONSE_CONVERSION]   - Reasoning content: %s chars", len(reasoning_content) if reasoning_content else 0)
 
     return text_content, tool_calls_result, reasoning_content, thinking_blocks_result
 
@@ -193,24 +252,29 @@ def _ensure_thinking_prefix(messages: List[Dict[str, Any]]) -> List[Dict[str, An
             updated_messages.append(message)
             continue
 
+        content = message.get("content")
+
+        if (
+            type(content) is list
+            and content
+            and type(content[0]) is dict
+            and content[0].get("type") in ("thinking", "redacted_thinking")
+        ):
+            # Already prefixed - nothing to change, so skip the copy
+            updated_messages.append(message)
+            continue
+
         new_message = message.copy()
-        content = new_message.get("content")
 
-        if isinstance(content, str):
+        if type(content) is str:
             blocks: List[Dict[str, Any]] = []
             blocks.append({"type": "thinking", "thinking": ""})
             if content:
                 blocks.append({"type": "text", "text": content})
             new_message["content"] = blocks
-        elif isinstance(content, list):
-            if content and isinstance(content[0], dict) and content[0].get("type") in ("thinking", "redacted_thinking"):
-                new_message["content"] = content
-            else:
-                new_content: List[Dict[str, Any]] = [{"type": "thinking", "thinking": ""}]
-                for block in content:
-                    new_content.append(block)
-                new_message["content"] = new_content
-        elif isinstance(content, dict):
+        elif type(content) is list:
+            new_message["content"] = [{"type": "thinking", "thinking": ""}, *content]
+        elif type(content) is dict:
             # Rare case: single dict, wrap it
             new_message["content"] = [{"type": "thinking", "thinking": ""}, content]
         else:
@@ -1,15 +1,15 @@
 """
 Request conversion from OpenAI to Anthropic format.
 """
-import json
 import logging
 from typing import Dict, Any
 
 from models import REASONING_BUDGET_MAP, resolve_model_metadata
+from utils.json_utils import LazyJSON, EMPTY_DICT
 from utils.thinking_cache import THINKING_CACHE
 from .message_converter import convert_openai_messages_to_anthropic
 from .tool_converter import convert_openai_tools_to_anthropic, convert_openai_functions_to_anthropic
-from .thinking_utils import _last_assistant_has_tool_use, _last_assistant_starts_with_thinking
+from .thinking_utils import _last_assistant_tool_use_and_thinking
 
 logger = logging.getLogger(__name__)
 
@@ -25,13 +25,13 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
         Anthropic messages request
     """
     logger.debug("[REQUEST_CONVERSION] ===== STARTING OPENAI TO ANTHROPIC CONVERSION =====")
-    logger.debug(f"[REQUEST_CONVERSION] Full OpenAI request: {json.dumps(openai_request, indent=2)}")
+    logger.debug("[REQUEST_CONVERSION] Full OpenAI request: %s", LazyJSON(openai_request))
 
     # Convert messages
     messages, system_blocks = convert_openai_messages_to_anthropic(openai_request.get("messages", []))
 
-    logger.debug(f"[REQUEST_CONVERSION] Converted messages ({len(messages)} messages): {json.dumps(messages, indent=2)}")
-    logger.debug(f"[REQUEST_CONVERSION] System blocks: {json.dumps(system_blocks, indent=2) if system_blocks else 'None'}")
+    logger.debug("[REQUEST_CONVERSION] Converted messages (%s messages): %s", len(messages), LazyJSON(messages))
+    logger.debug("[REQUEST_CONVERSION] System blocks: %s", LazyJSON(system_blocks) if system_blocks else 'None')
 
     # Parse model name for reasoning and 1M context variants
     model_name = openai_request.get("model", "claude-sonnet-4-5-20250929")
@@ -72,10 +72,17 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
         elif isinstance(stop, list):
             anthropic_request["stop_sequences"] = stop
 
+    # Requests arrive via model_dump(), so every field is present and unset
+    # ones are None. Read each tool-related field once and skip falsy values.
+    openai_tools = openai_request.get("tools")
+    openai_functions = openai_request.get("functions")
+    tool_choice = openai_request.get("tool_choice")
+    function_call = openai_request.get("function_call")
+
     # Convert tools
-    if "tools" in openai_request and openai_request["tools"]:
-        logger.debug(f"[REQUEST_CONVERSION] Found 'tools' field in OpenAI request with {len(openai_request['tools'])} tools")
-        tools = convert_openai_tools_to_anthropic(openai_request["tools"])
+    if openai_tools:
+        logger.debug(f"[REQUEST_CONVERSION] Found 'tools' field in OpenAI request with {len(openai_tools)} tools")
+        tools = convert_openai_tools_to_anthropic(openai_tools)
         if tools:
             anthropic_request["tools"] = tools
             logger.debug(f"[REQUEST_CONVERSION] Added {len(tools)} tools to Anthropic request")
@@ -83,17 +90,16 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
             logger.debug("[REQUEST_CONVERSION] No tools after conversion (empty result)")
 
     # Convert functions (legacy)
-    if "functions" in openai_request and openai_request["functions"]:
-        logger.debug(f"[REQUEST_CONVERSION] Found 'functions' field (legacy) in OpenAI request with {len(openai_request['functions'])} functions")
-        tools = convert_openai_functions_to_anthropic(openai_request["functions"])
+    if openai_functions:
+        logger.debug(f"[REQUEST_CONVERSION] Found 'functions' field (legacy) in OpenAI request with {len(openai_functions)} functions")
+        tools = convert_openai_functions_to_anthropic(openai_functions)
         if tools:
             anthropic_request["tools"] = tools
             logger.debug(f"[REQUEST_CONVERSION] Added {len(tools)} tools (from functions) to Anthropic request")
 
     # Handle tool_choice
-    if "tool_choice" in openai_request:
-        tool_choice = openai_request["tool_choice"]
-        logger.debug(f"[REQUEST_CONVERSION] Processing tool_choice: {json.dumps(tool_choice, indent=2)}")
+    if tool_choice:
+        logger.debug("[REQUEST_CONVERSION] Processing tool_choice: %s", LazyJSON(tool_choice))
 
         if tool_choice == "none":
             # Don't include tools
@@ -114,7 +120,7 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
                 pass
             elif choice_type == "function":
                 # Specific tool
-                function_name = tool_choice.get("function", {}).get("name")
+                function_name = tool_choice.get("function", EMPTY_DICT).get("name")
                 logger.debug(f"[REQUEST_CONVERSION] tool_choice type is 'function' with name='{function_name}'")
 
                 if function_name:
@@ -125,8 +131,7 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
                     logger.debug(f"[REQUEST_CONVERSION] Set Anthropic tool_choice to force tool: {function_name}")
 
     # Handle function_call (legacy)
-    if "function_call" in openai_request:
-        function_call = openai_request["function_call"]
+    if function_call:
         if function_call == "none":
             anthropic_request.pop("tools", None)
         elif function_call == "auto":
@@ -142,6 +147,10 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
     # Before enabling thinking, try to prepend a previously signed thinking
     # block to the last assistant message when tools are present.
     def _maybe_prepend_signed_thinking_for_tools() -> None:
+        # Nothing can be reattached until a thinking + tool_use turn was cached;
+        # skip the history walk for the (common) sessions that never have one
+        if not THINKING_CACHE:
+            return
         msgs = anthropic_request.get("messages") or []
         if not msgs:
             return
@@ -191,8 +200,9 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
     reasoning_level = None
 
     # Check for explicit reasoning_effort parameter (takes precedence)
-    if "reasoning_effort" in openai_request and openai_request["reasoning_effort"]:
-        reasoning_level = openai_request["reasoning_effort"]
+    reasoning_effort = openai_request.get("reasoning_effort")
+    if reasoning_effort:
+        reasoning_level = reasoning_effort
         logger.debug(f"Using reasoning_effort parameter: {reasoning_level}")
     # Check for model-based reasoning variant
     elif model_reasoning_level:
@@ -200,8 +210,8 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
         logger.debug(f"Using model-based reasoning: {reasoning_level} (from {model_name})")
 
     # Enable thinking if reasoning level is specified
-    if reasoning_level and reasoning_level in REASONING_BUDGET_MAP:
-        thinking_budget = REASONING_BUDGET_MAP[reasoning_level]
+    thinking_budget = REASONING_BUDGET_MAP.get(reasoning_level) if reasoning_level else None
+    if thinking_budget is not None:
 
         # Ensure max_tokens is sufficient for reasoning models
         # This must happen BEFORE we determine if thinking can be enabled,
@@ -223,8 +233,9 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
         # 1. There's no last assistant message, OR
         # 2. The last assistant message doesn't have tool_use, OR
         # 3. The last assistant message starts with thinking (we just prepended it from cache)
-        last_assistant_has_tools = _last_assistant_has_tool_use(anthropic_request["messages"]) if anthropic_request.get("messages") else False
-        last_assistant_has_thinking = _last_assistant_starts_with_thinking(anthropic_request["messages"]) if anthropic_request.get("messages") else False
+        last_assistant_has_tools, last_assistant_has_thinking = _last_assistant_tool_use_and_thinking(
+            anthropic_request.get("messages") or []
+        )
 
         if last_assistant_has_tools and not last_assistant_has_thinking:
             # Do NOT remove messages; that breaks tool_result -> tool_use linking
@@ -247,7 +258,7 @@ def convert_openai_request_to_anthropic(openai_request: Dict[str, Any]) -> Dict[
             )
 
     logger.debug("[REQUEST_CONVERSION] ===== FINAL ANTHROPIC REQUEST =====")
-    logger.debug(f"[REQUEST_CONVERSION] {json.dumps(anthropic_request, indent=2)}")
+    logger.debug("[REQUEST_CONVERSION] %s", LazyJSON(anthropic_request))
     logger.debug("[REQUEST_CONVERSION] ===== END CONVERSION =====")
 
     return anthropic_request
@@ -2,25 +2,27 @@
 Response conversion from Anthropic to OpenAI format.
 """
 import time
-import json
 import logging
 from typing import Dict, Any, Optional
 
 from .content_converter import convert_anthropic_content_to_openai
+from utils.json_utils import LazyJSON, EMPTY_DICT
 from utils.thinking_cache import THINKING_CACHE
 
 logger = logging.getLogger(__name__)
 
+# Anthropic stop_reason -> OpenAI finish_reason
+STOP_REASON_MAP = {
+    "end_turn": "stop",
+    "max_tokens": "length",
+    "stop_sequence": "stop",
+    "tool_use": "tool_calls"
+}
+
 
 def map_stop_reason_to_finish_reason(stop_reason: Optional[str]) -> str:
     """Map Anthropic stop_reason to OpenAI finish_reason."""
-    mapping = {
-        "end_turn": "stop",
-        "max_tokens": "length",
-        "stop_sequence": "stop",
-        "tool_use": "tool_calls"
-    }
-    return mapping.get(stop_reason, "stop")
+    return STOP_REASON_MAP.get(stop_reason, "stop")
 
 
 def convert_anthropic_response_to_openai(anthropic_response: Dict[str, Any], model: str) -> Dict[str, Any]:
@@ -35,7 +37,7 @@ def convert_anthropic_response_to_openai(anthropic_response: Dict[str, Any], mod
         OpenAI chat completion response
     """
     logger.debug("[RESPONSE_CONVERSION] ===== CONVERTING ANTHROPIC RESPONSE TO OPENAI =====")
-    logger.debug(f"[RESPONSE_CONVERSION] Full Anthropic response: {json.dumps(anthropic_response, indent=2)}")
+    logger.debug("[RESPONSE_CONVERSION] Full Anthropic response: %s", LazyJSON(anthropic_response))
 
     # Extract content with thinking/reasoning
     content = anthropic_response.get("content", [])
@@ -55,9 +57,7 @@ def convert_anthropic_response_to_openai(anthropic_response: Dict[str, Any], mod
             tool_ids = [tc["id"] for tc in tool_calls if tc.get("id")]
             if tool_ids:
                 logger.debug(f"[THINKING_CACHE] Storing signed thinking block for tool_use IDs: {tool_ids}")
-                for tid in tool_ids:
-                    THINKING_CACHE.put(tid, signed_thinking)
-                    logger.debug(f"[THINKING_CACHE] Stored thinking block for tool_use ID: {tid}")
+                THINKING_CACHE.put_many(tool_ids, signed_thinking)
 
     # Build message
     message = {
@@ -79,7 +79,7 @@ def convert_anthropic_response_to_openai(anthropic_response: Dict[str, Any], mod
     finish_reason = map_stop_reason_to_finish_reason(anthropic_response.get("stop_reason"))
 
     # Calculate usage with reasoning tokens
-    usage_obj = anthropic_response.get("usage", {})
+    usage_obj = anthropic_response.get("usage") or EMPTY_DICT
     prompt_tokens = usage_obj.get("input_tokens", 0)
     completion_tokens = usage_obj.get("output_tokens", 0)
 
@@ -119,7 +119,7 @@ def convert_anthropic_response_to_openai(anthropic_response: Dict[str, Any], mod
         "usage": usage
     }
 
-    logger.debug(f"[RESPONSE_CONVERSION] Final OpenAI response: {json.dumps(openai_response, indent=2)}")
+    logger.debug("[RESPONSE_CONVERSION] Final OpenAI response: %s", LazyJSON(openai_response))
     logger.debug("[RESPONSE_CONVERSION] ===== END RESPONSE CONVERSION =====")
 
     return openai_response
@@ -1,83 +1,134 @@
 """
 Server-Sent Events (SSE) parser for streaming responses.
 """
-from dataclasses import dataclass
+import sys
 from typing import List, Optional
 
+_COLON = ord(":")
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", "replace")
+
 
-@dataclass
 class SSEEvent:
-    """Represents a parsed Server-Sent Events frame."""
-    event: Optional[str]
-    data: str
+    """Represents a parsed Server-Sent Events frame.
+
+    The payload is kept as the raw bytes received, with surrounding
+    whitespace already stripped; JSON consumers can parse ``raw`` directly
+    and skip the UTF-8 decode that ``data`` performs.
+    """
+
+    # One instance per upstream event; slots keep them free of a __dict__
+    # (dataclass(slots=True) needs Python 3.10)
+    __slots__ = ("event", "raw")
+
+    def __init__(self, event: Optional[str], raw: bytes) -> None:
+        self.event = event
+        self.raw = raw
+
+    def __repr__(self) -> str:
+        return f"SSEEvent(event={self.event!r}, raw={self.raw!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not SSEEvent:
+            return NotImplemented
+        return self.event == other.event and self.raw == other.raw
+
+    @property
+    def data(self) -> str:
+        """The payload decoded as text."""
+        return _decode(self.raw)
 
 
 class SSEParser:
-    """Incremental parser for text/event-stream payloads."""
+    """Incremental parser for text/event-stream payloads.
+
+    Operates on raw bytes; payloads are handed out undecoded, so multi-byte
+    characters split across chunks need no special handling.
+    """
 
     def __init__(self) -> None:
-        self._buffer = ""
+        # Pending partial-line bytes, joined lazily once a newline arrives
+        self._chunks: List[bytes] = []
         self._current_event: Optional[str] = None
-        self._current_data: List[str] = []
+        self._current_data: List[bytes] = []
 
-    def feed(self, chunk: str) -> List[SSEEvent]:
-        """Consume raw chunk text and yield completed events."""
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Consume a raw chunk and yield completed events."""
         events: List[SSEEvent] = []
         if not chunk:
             return events
 
-        self._buffer += chunk
-
-        while True:
-            newline_idx = self._buffer.find("\n")
-            if newline_idx == -1:
-                break
+        self._chunks.append(chunk)
+        if b"\n" not in chunk:
+            # No line can have completed; defer the join
+            return events
 
-            line = self._buffer[:newline_idx]
-            self._buffer = self._buffer[newline_idx + 1:]
+        buf = b"".join(self._chunks)
+        if b"\r" in buf:
+            # Normalize Windows-style endings in one C-level pass
+            buf = buf.replace(b"\r\n", b"\n")
 
-            # Trim CR from Windows-style endings
-            if line.endswith("\r"):
-                line = line[:-1]
+        # Every element but the last is a complete line; the last is the
+        # unterminated tail to keep for the next chunk
+        lines = buf.split(b"\n")
+        tail = lines.pop()
 
-            if line == "":
+        for line in lines:
+            if not line:
                 # Blank line terminates the current event
                 if self._current_event is not None or self._current_data:
-                    data = "\n".join(self._current_data)
-                    events.append(SSEEvent(event=self._current_event, data=data))
+                    raw = b"\n".join(self._current_data).strip()
+                    events.append(SSEEvent(event=self._current_event, raw=raw))
                 self._current_event = None
-                self._current_data = []
-                continue
-
-            if line.startswith(":"):
+                # Reuse the list: the joined payload above no longer refers to it
+                self._current_data.clear()
+            elif line[0] == _COLON:
                 # Comment line - ignore
                 continue
+            else:
+                handler = self._PREFIX_DISPATCH.get(line[:5])
+                if handler is not None:
+                    handler(self, line)
+                else:
+                    # Fallback: treat as data line (defensive)
+                    self._current_data.append(line)
+
+        self._chunks = [tail] if tail else []
+        return events
 
-            if line.startswith("event:"):
-                self._current_event = line[6:].lstrip()
-                continue
-
-            if line.startswith("data:"):
-                data_value = line[5:]
-                if data_value.startswith(" "):
-                    data_value = data_value[1:]
-                self._current_data.append(data_value)
-                continue
-
-            # Fallback: treat as data line (defensive)
+    def _handle_event(self, line: bytes) -> None:
+        """Handle a line starting with ``event``."""
+        if line[5:6] == b":":
+            # Only a handful of distinct event names exist; interning makes
+            # downstream comparisons and dict lookups pointer-fast
+            self._current_event = sys.intern(_decode(line[6:].strip()))
+        else:
+            # Not actually an event field; treat as data line (defensive)
             self._current_data.append(line)
 
-        return events
+    def _handle_data(self, line: bytes) -> None:
+        """Handle a ``data:`` line."""
+        # Strip the prefix and its optional single space in one slice
+        self._current_data.append(line[6:] if line[5:6] == b" " else line[5:])
+
+    # Field handlers keyed by the first five bytes of a line
+    _PREFIX_DISPATCH = {
+        b"data:": _handle_data,
+        b"event": _handle_event,
+    }
 
     def flush(self) -> List[SSEEvent]:
         """Flush any remaining buffered event (used at stream end)."""
         events: List[SSEEvent] = []
         if self._current_event is not None or self._current_data:
-            data = "\n".join(self._current_data)
-            events.append(SSEEvent(event=self._current_event, data=data))
-        if self._buffer:
-            events.append(SSEEvent(event=None, data=self._buffer))
+            raw = b"\n".join(self._current_data).strip()
+            events.append(SSEEvent(event=self._current_event, raw=raw))
+        remainder = b"".join(self._chunks).strip()
+        if remainder:
+            events.append(SSEEvent(event=None, raw=remainder))
         self._current_event = None
-        self._current_data = []
-        self._buffer = ""
+        self._current_data.clear()
+        self._chunks = []
         return events
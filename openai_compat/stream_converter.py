@@ -2,89 +2,432 @@
 Stream conversion from Anthropic SSE format to OpenAI streaming format.
 """
 import time
-import json
 import logging
 from typing import Dict, Any, List, AsyncIterator, Optional, TYPE_CHECKING
 
+from settings import STREAM_COALESCE
+from utils.json_utils import LazyJSON, fast_dumps_bytes, fast_loads, EMPTY_DICT
 from utils.thinking_cache import THINKING_CACHE
 from .sse_parser import SSEParser
-from .response_converter import map_stop_reason_to_finish_reason
+from .response_converter import STOP_REASON_MAP
 
 logger = logging.getLogger(__name__)
 
+# Opening delta of every stream; only ever serialized, never mutated
+_ROLE_DELTA: Dict[str, Any] = {"role": "assistant", "content": ""}
+
+# Empty delta carried by the finish_reason chunk; likewise only serialized
+_FINISH_DELTA: Dict[str, Any] = {}
+
+# Field holding the reasoning text for each thinking delta type
+_REASONING_DELTA_FIELDS = {
+    "thinking_delta": "thinking",
+    "redacted_thinking_delta": "text",
+}
+
 if TYPE_CHECKING:
     from stream_debug import StreamTracer
 
 
+def _error_frame(message: Any, error_type: Any) -> bytes:
+    """Render an OpenAI-style {"error": {...}} SSE frame."""
+    return (
+        b'data: {"error":{"message":' + fast_dumps_bytes(message)
+        + b',"type":' + fast_dumps_bytes(error_type) + b"}}\n\n"
+    )
+
+
+class _ToolCallState:
+    """Per tool_use block state, keyed by the Anthropic content block index."""
+
+    # One instance per streamed tool call; slots keep them free of a __dict__
+    __slots__ = ("openai_index", "id", "name", "arguments_parts", "frame_prefix")
+
+    def __init__(self, openai_index: int, tool_id: str, name: str, frame_prefix: bytes) -> None:
+        self.openai_index = openai_index
+        self.id = tool_id
+        self.name = name
+        # Argument fragments, joined once at content_block_stop
+        self.arguments_parts: List[str] = []
+        # Serialized frame up to the arguments value, shared by both chunks
+        self.frame_prefix = frame_prefix
+
+
+class _ThinkingBlockState:
+    """Accumulated text and signature of one thinking block, for reattachment."""
+
+    __slots__ = ("thinking_parts", "signature")
+
+    def __init__(self, signature: Optional[str]) -> None:
+        self.thinking_parts: List[str] = []
+        self.signature = signature
+
+
+def _passthrough(chunk: bytes) -> bytes:
+    """Emitter used when the stream is not traced."""
+    return chunk
+
+
 async def convert_anthropic_stream_to_openai(
-    anthropic_stream: AsyncIterator[str],
+    anthropic_stream: AsyncIterator[bytes],
     model: str,
     request_id: str,
     tracer: Optional["StreamTracer"] = None,
-) -> AsyncIterator[str]:
+) -> AsyncIterator[bytes]:
     """
     Convert Anthropic SSE stream to OpenAI chat completion stream format.
 
     Args:
-        anthropic_stream: Anthropic SSE stream
+        anthropic_stream: Anthropic SSE stream (raw bytes)
         model: Model name
         request_id: Request ID for logging
 
     Yields:
-        OpenAI-formatted SSE chunks
+        OpenAI-formatted SSE chunks, already UTF-8 encoded
     """
-    completion_id = f"chatcmpl-{int(time.time())}"
     created = int(time.time())
+    completion_id = f"chatcmpl-{created}"
 
     parser = SSEParser()
     converted_index = 0
 
     # Track tool call state: map Anthropic block index -> OpenAI tool call metadata
-    tool_call_states: Dict[int, Dict[str, Any]] = {}
+    tool_call_states: Dict[int, _ToolCallState] = {}
     next_tool_index = 0
-    thinking_states: Dict[int, Dict[str, Any]] = {}
 
     if tracer:
         tracer.log_note("starting OpenAI stream conversion")
 
-    def emit(payload: Dict[str, Any]) -> str:
+    # Frames are built as bytes so nothing is re-encoded on the way to the socket
+    def trace_chunk(chunk: bytes) -> bytes:
         nonlocal converted_index
         converted_index += 1
-        chunk_str = f"data: {json.dumps(payload)}\n\n"
-        if tracer:
-            tracer.log_note(f"emitting OpenAI chunk #{converted_index}")
-            tracer.log_converted_chunk(chunk_str)
-        return chunk_str
-
-    def emit_reasoning(text: str) -> str:
-        payload = {
-            "id": completion_id,
-            "object": "chat.completion.chunk",
-            "created": created,
-            "model": model,
-            "choices": [
-                {
-                    "index": 0,
-                    "delta": {
-                        "reasoning_content": text
-                    },
-                    "finish_reason": None
-                }
-            ]
-        }
-        return emit(payload)
+        tracer.log_note(f"emitting OpenAI chunk #{converted_index}")
+        tracer.log_converted_chunk(chunk)
+        return chunk
+
+    # Tracing is fixed for the whole stream, so pick the emitter once instead
+    # of testing the tracer on every chunk
+    emit_raw = trace_chunk if tracer else _passthrough
+
+    def emit(payload: Dict[str, Any]) -> bytes:
+        return emit_raw(b"data: " + fast_dumps_bytes(payload) + b"\n\n")
+
+    # Invariant chunk skeleton reused for every delta; only the choice's
+    # delta and finish_reason change. Safe because emit() serializes immediately.
+    chunk_choice: Dict[str, Any] = {"index": 0, "delta": None, "finish_reason": None}
+    chunk_template: Dict[str, Any] = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [chunk_choice]
+    }
+
+    def emit_delta(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> bytes:
+        chunk_choice["delta"] = delta
+        chunk_choice["finish_reason"] = finish_reason
+        return emit(chunk_template)
+
+    # Pre-serialized frame pieces for the hottest deltas (text and reasoning):
+    # only the JSON-encoded text itself is produced per chunk
+    frame_head = (
+        b'data: {"id":' + fast_dumps_bytes(completion_id)
+        + b',"object":"chat.completion.chunk","created":' + str(created).encode("ascii")
+        + b',"model":' + fast_dumps_bytes(model)
+        + b',"choices":[{"index":0,"delta":{'
+    )
+    text_prefix = frame_head + b'"content":'
+    reasoning_prefix = frame_head + b'"reasoning_content":'
+    frame_tail = b'},"finish_reason":null}]}\n\n'
+
+    def emit_text(text: str) -> bytes:
+        return emit_raw(text_prefix + fast_dumps_bytes(text) + frame_tail)
+
+    def emit_reasoning(text: str) -> bytes:
+        return emit_raw(reasoning_prefix + fast_dumps_bytes(text) + frame_tail)
+
+    tool_call_tail = b"}}]" + frame_tail
+
+    def tool_call_prefix(openai_index: int, tool_id: str, name: str) -> bytes:
+        """Pre-serialize a tool call's frame up to its arguments value."""
+        return (
+            frame_head + b'"tool_calls":[{"index":' + str(openai_index).encode("ascii")
+            + b',"id":' + fast_dumps_bytes(tool_id)
+            + b',"type":"function","function":{"name":' + fast_dumps_bytes(name)
+            + b',"arguments":'
+        )
+
+    def emit_tool_call(call_state: _ToolCallState, arguments: str) -> bytes:
+        return emit_raw(call_state.frame_prefix + fast_dumps_bytes(arguments) + tool_call_tail)
 
     # Capture signed thinking + tool_use ids for potential reattachment
     current_tool_use_ids: List[str] = []
-    # Map content_block index -> accumulator {thinking: str, signature: str | None}
-    current_thinking_blocks: Dict[int, Dict[str, Any]] = {}
+    # Map content_block index -> thinking accumulator
+    current_thinking_blocks: Dict[int, _ThinkingBlockState] = {}
+
+    # Converted chunks for the current upstream read, sent as one write so a
+    # read carrying many small events costs a single downstream send
+    pending: List[bytes] = []
+    # Consecutive text deltas from the current read, merged into one chunk
+    text_run: List[str] = []
+
+    def flush_text_run() -> None:
+        if text_run:
+            pending.append(emit_text("".join(text_run)))
+            text_run.clear()
+
+    def push(chunk: bytes) -> None:
+        # Keep ordering: any buffered text goes out before a non-text chunk
+        flush_text_run()
+        pending.append(chunk)
+
+    def handle_text_delta(data: Dict[str, Any], delta: Dict[str, Any]) -> None:
+        text = delta.get("text")
+        if not text:
+            return
+        if STREAM_COALESCE:
+            text_run.append(text)
+        else:
+            pending.append(emit_text(text))
+
+    def handle_input_json_delta(data: Dict[str, Any], delta: Dict[str, Any]) -> None:
+        # Upstream opens every tool block with an empty fragment; it adds nothing
+        partial_json = delta.get("partial_json")
+        if not partial_json:
+            return
+
+        sse_index = data.get("index")
+        if sse_index is None:
+            logger.warning(f"[{request_id}] input_json_delta missing index: {data}")
+            return
+
+        call_state = tool_call_states.get(sse_index)
+        if call_state is None:
+            logger.warning(f"[{request_id}] input_json_delta for unknown tool index {sse_index}")
+            return
+
+        # Collect fragments and join once at content_block_stop; str += on a
+        # dict-held string copies the whole buffer every time
+        call_state.arguments_parts.append(partial_json)
+
+        logger.debug("[%s] [STREAM_TOOL] Received input_json_delta for index %s: %s...", request_id, sse_index, partial_json[:100])
+        logger.debug("[%s] [STREAM_TOOL] Accumulated %s argument fragments so far", request_id, len(call_state.arguments_parts))
+
+        # CRITICAL FIX: Do NOT stream partial JSON arguments character-by-character
+        # This causes clients like Cursor to parse incomplete JSON values
+        # (e.g., {"name": "A"} instead of {"name": "Add OpenRouter Example"})
+        # Instead, we buffer the complete arguments and send them at content_block_stop
+        #
+        # Original buggy code that streamed partial JSON:
+        # delta_chunk = {
+        #     "id": completion_id,
+        #     "object": "chat.completion.chunk",
+        #     "created": created,
+        #     "model": model,
+        #     "choices": [
+        #         {
+        #             "index": 0,
+        #             "delta": {
+        #                 "tool_calls": [
+        #                     {
+        #                         "index": call_state["openai_index"],
+        #                         "id": call_state["id"],
+        #                         "type": "function",
+        #                         "function": {
+        #                             "name": call_state["name"],
+        #                             "arguments": partial_json  # <-- BUG: partial JSON
+        #                         }
+        #                     }
+        #                 ]
+        #             },
+        #             "finish_reason": None
+        #         }
+        #     ]
+        # }
+        # yield emit(delta_chunk)
+
+        # Just accumulate the arguments, don't emit anything yet
+
+    def handle_thinking_delta(data: Dict[str, Any], delta: Dict[str, Any]) -> None:
+        sse_index = data.get("index")
+        if sse_index is None:
+            logger.debug("[%s] thinking delta missing index: %s", request_id, data)
+            return
+        # One lookup for the field the delta type carries; the generic chain
+        # only runs for payloads that don't follow the schema
+        reasoning_text = delta.get(_REASONING_DELTA_FIELDS[delta["type"]]) or (
+            delta.get("text")
+            or delta.get("thinking")
+            or delta.get("partial_text")
+            or ""
+        )
+        if reasoning_text:
+            push(emit_reasoning(reasoning_text))
+            # Accumulate full thinking text for later reattachment
+            acc = current_thinking_blocks.get(sse_index)
+            if acc is not None:
+                acc.thinking_parts.append(reasoning_text)
+
+    # content_block_delta handlers keyed by delta type
+    delta_handlers = {
+        "text_delta": handle_text_delta,
+        "input_json_delta": handle_input_json_delta,
+        "thinking_delta": handle_thinking_delta,
+        "redacted_thinking_delta": handle_thinking_delta,
+    }
+
+    def handle_content_block_delta(data: Dict[str, Any]) -> bool:
+        delta = data.get("delta") or EMPTY_DICT
+        delta_handler = delta_handler_for(delta.get("type"))
+        if delta_handler is not None:
+            delta_handler(data, delta)
+        return False
+
+    def handle_message_start(data: Dict[str, Any]) -> bool:
+        push(emit_delta(_ROLE_DELTA))
+        return False
+
+    def handle_content_block_start(data: Dict[str, Any]) -> bool:
+        nonlocal next_tool_index
+        content_block = data.get("content_block") or EMPTY_DICT
+        block_type = content_block.get("type")
+
+        if block_type == "tool_use":
+            sse_index = data.get("index")
+            if sse_index is None:
+                logger.warning(f"[{request_id}] Tool use block missing index: {data}")
+                return False
+
+            logger.debug("[%s] [STREAM_TOOL] Starting tool_use block at index %s", request_id, sse_index)
+            logger.debug("[%s] [STREAM_TOOL] Content block: %s", request_id, LazyJSON(content_block))
+
+            tool_id = content_block.get("id", "")
+            tool_name = content_block.get("name", "")
+            # Both the initial and final chunks for this call share everything but the arguments
+            call_state = _ToolCallState(
+                next_tool_index, tool_id, tool_name,
+                tool_call_prefix(next_tool_index, tool_id, tool_name),
+            )
+            tool_call_states[sse_index] = call_state
+            next_tool_index += 1
+
+            logger.debug(
+                "[%s] [STREAM_TOOL] Created call_state: openai_index=%s id=%s name=%s",
+                request_id, call_state.openai_index, call_state.id, call_state.name,
+            )
+
+            logger.debug("[%s] [STREAM_TOOL] Emitting initial tool_call delta for %s", request_id, call_state.name)
+            push(emit_tool_call(call_state, ""))
+            # Track tool_use ids for this assistant message
+            if tool_id:
+                current_tool_use_ids.append(tool_id)
+            return False
+
+        if block_type in ("thinking", "redacted_thinking"):
+            sse_index = data.get("index")
+            if sse_index is not None:
+                # Initialize accumulator for this thinking block (capture signature if present)
+                current_thinking_blocks[sse_index] = _ThinkingBlockState(content_block.get("signature"))
+        return False
+
+    def handle_content_block_stop(data: Dict[str, Any]) -> bool:
+        sse_index = data.get("index")
+        if sse_index is not None:
+            # If this was a tool call, send the complete arguments now; the
+            # pop both fetches and retires its state
+            call_state = states_pop(sse_index, None)
+            arguments = "".join(call_state.arguments_parts) if call_state is not None else ""
+            if arguments:
+                logger.debug("[%s] [STREAM_TOOL] Tool block stopped, sending complete arguments", request_id)
+                logger.debug("[%s] [STREAM_TOOL] Complete arguments: %s", request_id, arguments)
+
+                # Send the complete arguments in one chunk
+                push(emit_tool_call(call_state, arguments))
+        return False
+
+    def handle_message_delta(data: Dict[str, Any]) -> bool:
+        delta = data.get("delta") or EMPTY_DICT
+        stop_reason = delta.get("stop_reason")
+
+        if stop_reason:
+            finish_reason = stop_reason_map_get(stop_reason, "stop")
+
+            push(emit_delta(_FINISH_DELTA, finish_reason))
+        return False
+
+    def handle_message_stop(data: Dict[str, Any]) -> bool:
+        # On assistant message completion, persist signed thinking (if available) keyed by tool ids
+        # so we can reattach on the next request.
+        # Use the first thinking block captured.
+        saved_block = None
+        for acc in current_thinking_blocks.values():
+            sig = acc.signature
+            if acc.thinking_parts and isinstance(sig, str) and sig.strip():
+                saved_block = {"type": "thinking", "thinking": "".join(acc.thinking_parts), "signature": sig}
+                break
+        if saved_block and current_tool_use_ids:
+            logger.debug("[THINKING_CACHE] Storing signed thinking block for tool_use IDs: %s", current_tool_use_ids)
+            THINKING_CACHE.put_many(current_tool_use_ids, saved_block)
+        elif saved_block and not current_tool_use_ids:
+            logger.debug("[THINKING_CACHE] Have signed thinking block but no tool_use IDs to cache it with")
+        elif not saved_block and current_tool_use_ids:
+            logger.debug("[THINKING_CACHE] Have tool_use IDs %s but no signed thinking block to cache", current_tool_use_ids)
+        # Reset accumulators for safety in case of continued streaming
+        current_tool_use_ids.clear()
+        current_thinking_blocks.clear()
+
+        if tracer:
+            tracer.log_note("received message_stop event")
+        return True
+
+    def handle_error(data: Dict[str, Any]) -> bool:
+        # Handle error events - error can be a string or a dict
+        error_value = data.get("error", EMPTY_DICT)
+        if isinstance(error_value, str):
+            # Simple string error (e.g., from timeout)
+            error_message, error_type = error_value, "api_error"
+        elif isinstance(error_value, dict):
+            # Structured error from Anthropic
+            error_message = error_value.get("message", "Unknown error")
+            error_type = error_value.get("type", "api_error")
+        else:
+            # Fallback for unexpected format
+            error_message, error_type = str(error_value), "api_error"
+
+        if tracer:
+            tracer.log_error(f"anthropic error event: {error_type}: {error_message}")
+        push(emit_raw(_error_frame(error_message, error_type)))
+        return True
+
+    # Event handlers keyed by event type; each returns True when the stream is
+    # finished. Types without a handler (ping, unknown) are ignored.
+    event_handlers = {
+        "content_block_delta": handle_content_block_delta,
+        "message_start": handle_message_start,
+        "content_block_start": handle_content_block_start,
+        "content_block_stop": handle_content_block_stop,
+        "message_delta": handle_message_delta,
+        "message_stop": handle_message_stop,
+        "error": handle_error,
+    }
+
+    # Bind per-event lookups once so the loop body resolves them as locals
+    feed = parser.feed
+    loads = fast_loads
+    delta_handler_for = delta_handlers.get
+    event_handler_for = event_handlers.get
+    states_pop = tool_call_states.pop
+    stop_reason_map_get = STOP_REASON_MAP.get
 
     try:
         stream_finished = False
         async for chunk in anthropic_stream:
-            for event in parser.feed(chunk):
-                event_name = (event.event or "").strip()
-                raw_data = event.data.strip()
+            for event in feed(chunk):
+                # The parser hands out stripped fields; event is None when unnamed
+                event_name = event.event
+                # Parse the payload bytes as-is; both orjson and json accept UTF-8
+                raw_data = event.raw
 
                 if not raw_data:
                     continue
@@ -94,346 +437,36 @@ async def convert_anthropic_stream_to_openai(
                     continue
 
                 try:
-                    data = json.loads(raw_data)
-                except json.JSONDecodeError:
-                    logger.warning(f"[{request_id}] Failed to decode SSE data: {raw_data}")
-                    continue
-
-                data_type = data.get("type") or event_name
-
-                if data_type == "ping":
+                    data = loads(raw_data)
+                except ValueError:
+                    # JSONDecodeError, or UnicodeDecodeError for invalid UTF-8
+                    logger.warning(f"[{request_id}] Failed to decode SSE data: {event.data}")
                     continue
 
-                if data_type == "message_start":
-                    initial_chunk = {
-                        "id": completion_id,
-                        "object": "chat.completion.chunk",
-                        "created": created,
-                        "model": model,
-                        "choices": [
-                            {
-                                "index": 0,
-                                "delta": {"role": "assistant", "content": ""},
-                                "finish_reason": None
-                            }
-                        ]
-                    }
-                    yield emit(initial_chunk)
-                    continue
-
-                if data_type == "content_block_start":
-                    content_block = data.get("content_block", {}) or {}
-                    block_type = content_block.get("type")
-
-                    if block_type == "tool_use":
-                        sse_index = data.get("index")
-                        if sse_index is None:
-                            logger.warning(f"[{request_id}] Tool use block missing index: {data}")
-                            continue
-
-                        logger.debug(f"[{request_id}] [STREAM_TOOL] Starting tool_use block at index {sse_index}")
-                        logger.debug(f"[{request_id}] [STREAM_TOOL] Content block: {json.dumps(content_block, indent=2)}")
-
-                        call_state = {
-                            "openai_index": next_tool_index,
-                            "id": content_block.get("id", ""),
-                            "name": content_block.get("name", ""),
-                            "arguments": ""
-                        }
-                        tool_call_states[sse_index] = call_state
-                        next_tool_index += 1
-
-                        logger.debug(f"[{request_id}] [STREAM_TOOL] Created call_state: {json.dumps(call_state, indent=2)}")
-
-                        delta_chunk = {
-                            "id": completion_id,
-                            "object": "chat.completion.chunk",
-                            "created": created,
-                            "model": model,
-                            "choices": [
-                                {
-                                    "index": 0,
-                                    "delta": {
-                                        "tool_calls": [
-                                            {
-                                                "index": call_state["openai_index"],
-                                                "id": call_state["id"],
-                                                "type": "function",
-                                                "function": {
-                                                    "name": call_state["name"],
-                                                    "arguments": ""
-                                                }
-                                            }
-                                        ]
-                                    },
-                                    "finish_reason": None
-                                }
-                            ]
-                        }
-
-                        logger.debug(f"[{request_id}] [STREAM_TOOL] Emitting initial tool_call delta: {json.dumps(delta_chunk, indent=2)}")
-                        yield emit(delta_chunk)
-                        # Track tool_use ids for this assistant message
-                        tool_id = content_block.get("id")
-                        if tool_id:
-                            current_tool_use_ids.append(tool_id)
-                        continue
-
-                    if block_type in ("thinking", "redacted_thinking"):
-                        sse_index = data.get("index")
-                        if sse_index is not None:
-                            thinking_states[sse_index] = {
-                                "type": block_type
-                            }
-                            # Initialize accumulator for this thinking block (capture signature if present)
-                            signature = content_block.get("signature")
-                            current_thinking_blocks[sse_index] = {
-                                "thinking": "",
-                                "signature": signature,
-                            }
-                        continue
-
-                if data_type == "content_block_delta":
-                    delta = data.get("delta", {}) or {}
-                    delta_type = delta.get("type")
-
-                    if delta_type == "text_delta":
-                        text = delta.get("text", "")
-                        if text:
-                            delta_chunk = {
-                                "id": completion_id,
-                                "object": "chat.completion.chunk",
-                                "created": created,
-                                "model": model,
-                                "choices": [
-                                    {
-                                        "index": 0,
-                                        "delta": {"content": text},
-                                        "finish_reason": None
-                                    }
-                                ]
-                            }
-                            yield emit(delta_chunk)
-                        continue
-
-                    if delta_type == "input_json_delta":
-                        sse_index = data.get("index")
-                        if sse_index is None:
-                            logger.warning(f"[{request_id}] input_json_delta missing index: {data}")
-                            continue
-
-                        call_state = tool_call_states.get(sse_index)
-                        if not call_state:
-                            logger.warning(f"[{request_id}] input_json_delta for unknown tool index {sse_index}")
-                            continue
-
-                        partial_json = delta.get("partial_json", "")
-                        call_state["arguments"] += partial_json
-
-                        logger.debug(f"[{request_id}] [STREAM_TOOL] Received input_json_delta for index {sse_index}: {partial_json[:100]}...")
-                        logger.debug(f"[{request_id}] [STREAM_TOOL] Accumulated arguments so far: {call_state['arguments'][:200]}...")
-
-                        # CRITICAL FIX: Do NOT stream partial JSON arguments character-by-character
-                        # This causes clients like Cursor to parse incomplete JSON values
-                        # (e.g., {"name": "A"} instead of {"name": "Add OpenRouter Example"})
-                        # Instead, we buffer the complete arguments and send them at content_block_stop
-                        #
-                        # Original buggy code that streamed partial JSON:
-                        # delta_chunk = {
-                        #     "id": completion_id,
-                        #     "object": "chat.completion.chunk",
-                        #     "created": created,
-                        #     "model": model,
-                        #     "choices": [
-                        #         {
-                        #             "index": 0,
-                        #             "delta": {
-                        #                 "tool_calls": [
-                        #                     {
-                        #                         "index": call_state["openai_index"],
-                        #                         "id": call_state["id"],
-                        #                         "type": "function",
-                        #                         "function": {
-                        #                             "name": call_state["name"],
-                        #                             "arguments": partial_json  # <-- BUG: partial JSON
-                        #                         }
-                        #                     }
-                        #                 ]
-                        #             },
-                        #             "finish_reason": None
-                        #         }
-                        #     ]
-                        # }
-                        # yield emit(delta_chunk)
-
-                        # Just accumulate the arguments, don't emit anything yet
-                        continue
-
-                    if delta_type in ("thinking_delta", "redacted_thinking_delta"):
-                        sse_index = data.get("index")
-                        if sse_index is None:
-                            logger.debug(f"[{request_id}] thinking delta missing index: {data}")
-                            continue
-                        if sse_index not in thinking_states:
-                            thinking_states[sse_index] = {"type": delta_type}
-                        reasoning_text = (
-                            delta.get("text")
-                            or delta.get("thinking")
-                            or delta.get("partial_text")
-                            or ""
-                        )
-                        if reasoning_text:
-                            yield emit_reasoning(reasoning_text)
-                            # Accumulate full thinking text for later reattachment
-                            acc = current_thinking_blocks.get(sse_index)
-                            if acc is not None:
-                                acc["thinking"] = (acc.get("thinking", "") + reasoning_text)
-                        continue
-
-                if data_type == "content_block_stop":
-                    sse_index = data.get("index")
-                    if sse_index is not None:
-                        # If this was a tool call, send the complete arguments now
-                        call_state = tool_call_states.get(sse_index)
-                        if call_state and call_state.get("arguments"):
-                            logger.debug(f"[{request_id}] [STREAM_TOOL] Tool block stopped, sending complete arguments")
-                            logger.debug(f"[{request_id}] [STREAM_TOOL] Complete arguments: {call_state['arguments']}")
-
-                            # Send the complete arguments in one chunk
-                            final_args_chunk = {
-                                "id": completion_id,
-                                "object": "chat.completion.chunk",
-                                "created": created,
-                                "model": model,
-                                "choices": [
-                                    {
-                                        "index": 0,
-                                        "delta": {
-                                            "tool_calls": [
-                                                {
-                                                    "index": call_state["openai_index"],
-                                                    "id": call_state["id"],
-                                                    "type": "function",
-                                                    "function": {
-                                                        "name": call_state["name"],
-                                                        "arguments": call_state["arguments"]
-                                                    }
-                                                }
-                                            ]
-                                        },
-                                        "finish_reason": None
-                                    }
-                                ]
-                            }
-                            yield emit(final_args_chunk)
-
-                        tool_call_states.pop(sse_index, None)
-                        thinking_states.pop(sse_index, None)
-                    continue
-
-                if data_type == "message_stop":
-                    # On assistant message completion, persist signed thinking (if available) keyed by tool ids
-                    # so we can reattach on the next request.
-                    # Use the first thinking block captured.
-                    saved_block = None
-                    for acc in current_thinking_blocks.values():
-                        sig = acc.get("signature")
-                        if acc.get("thinking") and isinstance(sig, str) and sig.strip():
-                            saved_block = {"type": "thinking", "thinking": acc["thinking"], "signature": sig}
-                            break
-                    if saved_block and current_tool_use_ids:
-                        logger.debug(f"[THINKING_CACHE] Storing signed thinking block for tool_use IDs: {current_tool_use_ids}")
-                        for tid in current_tool_use_ids:
-                            THINKING_CACHE.put(tid, saved_block)
-                            logger.debug(f"[THINKING_CACHE] Stored thinking block for tool_use ID: {tid}")
-                    elif saved_block and not current_tool_use_ids:
-                        logger.debug("[THINKING_CACHE] Have signed thinking block but no tool_use IDs to cache it with")
-                    elif not saved_block and current_tool_use_ids:
-                        logger.debug(f"[THINKING_CACHE] Have tool_use IDs {current_tool_use_ids} but no signed thinking block to cache")
-                    # Reset accumulators for safety in case of continued streaming
-                    current_tool_use_ids.clear()
-                    current_thinking_blocks.clear()
-
-                if data_type == "message_delta":
-                    delta = data.get("delta", {}) or {}
-                    stop_reason = delta.get("stop_reason")
-
-                    if stop_reason:
-                        finish_reason = map_stop_reason_to_finish_reason(stop_reason)
-
-                        final_chunk = {
-                            "id": completion_id,
-                            "object": "chat.completion.chunk",
-                            "created": created,
-                            "model": model,
-                            "choices": [
-                                {
-                                    "index": 0,
-                                    "delta": {},
-                                    "finish_reason": finish_reason
-                                }
-                            ]
-                        }
-                        yield emit(final_chunk)
-                    continue
-
-                if data_type == "message_stop":
-                    if tracer:
-                        tracer.log_note("received message_stop event")
+                event_handler = event_handler_for(data.get("type") or event_name)
+                if event_handler is not None and event_handler(data):
                     stream_finished = True
                     break
 
-                if data_type == "error":
-                    # Handle error events - error can be a string or a dict
-                    error_value = data.get("error", {})
-                    if isinstance(error_value, str):
-                        # Simple string error (e.g., from timeout)
-                        error_chunk = {
-                            "error": {
-                                "message": error_value,
-                                "type": "api_error"
-                            }
-                        }
-                    elif isinstance(error_value, dict):
-                        # Structured error from Anthropic
-                        error_chunk = {
-                            "error": {
-                                "message": error_value.get("message", "Unknown error"),
-                                "type": error_value.get("type", "api_error")
-                            }
-                        }
-                    else:
-                        # Fallback for unexpected format
-                        error_chunk = {
-                            "error": {
-                                "message": str(error_value),
-                                "type": "api_error"
-                            }
-                        }
-
-                    if tracer:
-                        tracer.log_error(f"anthropic error event: {error_chunk}")
-                    yield emit(error_chunk)
-                    stream_finished = True
-                    break
+            flush_text_run()
+            if pending:
+                batch = b"".join(pending)
+                pending.clear()
+                yield batch
 
             if stream_finished:
                 break
 
     except Exception as e:
         logger.error(f"[{request_id}] Error converting stream: {e}")
-        error_chunk = {
-            "error": {
-                "message": str(e),
-                "type": "conversion_error"
-            }
-        }
         if tracer:
             tracer.log_error(f"conversion exception: {e}")
-        yield emit(error_chunk)
+        # Flush anything converted before the failure, then the error
+        push(emit_raw(_error_frame(str(e), "conversion_error")))
+        yield b"".join(pending)
 
     # Send [DONE] marker
-    done_chunk = "data: [DONE]\n\n"
+    done_chunk = b"data: [DONE]\n\n"
     if tracer:
         tracer.log_note("emitting [DONE] marker")
         tracer.log_converted_chunk(done_chunk)
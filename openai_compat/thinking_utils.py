@@ -1,7 +1,7 @@
 """
 Utilities for handling thinking/reasoning blocks in messages.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 
 def _conversation_contains_tools(messages: List[Dict[str, Any]]) -> bool:
@@ -21,31 +21,26 @@ def _conversation_contains_tools(messages: List[Dict[str, Any]]) -> bool:
     return False
 
 
-def _last_assistant_starts_with_thinking(messages: List[Dict[str, Any]]) -> bool:
-    """Check if the last assistant message begins with a thinking/redacted_thinking block."""
-    for msg in reversed(messages):
-        if msg.get("role") != "assistant":
-            continue
-        content = msg.get("content")
-        if isinstance(content, list) and content:
-            first = content[0]
-            if isinstance(first, dict) and first.get("type") in ("thinking", "redacted_thinking"):
-                return True
-        # Found last assistant but doesn't start with thinking
-        return False
-    return False
+def _last_assistant_tool_use_and_thinking(messages: List[Dict[str, Any]]) -> Tuple[bool, bool]:
+    """
+    Inspect the last assistant message in one backwards scan.
 
-
-def _last_assistant_has_tool_use(messages: List[Dict[str, Any]]) -> bool:
-    """Check if the last assistant message contains any tool_use blocks."""
+    Returns:
+        tuple: (has_tool_use, starts_with_thinking) - whether its content
+        contains a tool_use block, and whether it begins with a
+        thinking/redacted_thinking block. Both are False when there is no
+        assistant message or its content is not a non-empty list.
+    """
     for msg in reversed(messages):
         if msg.get("role") != "assistant":
             continue
         content = msg.get("content")
-        if isinstance(content, list):
-            for block in content:
-                if isinstance(block, dict) and block.get("type") == "tool_use":
-                    return True
-        # Found last assistant, checked its content
-        return False
-    return False
+        if not isinstance(content, list) or not content:
+            return False, False
+        first = content[0]
+        starts_with_thinking = isinstance(first, dict) and first.get("type") in ("thinking", "redacted_thinking")
+        for block in content:
+            if isinstance(block, dict) and block.get("type") == "tool_use":
+                return True, starts_with_thinking
+        return False, starts_with_thinking
+    return False, False
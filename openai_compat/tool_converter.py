@@ -5,20 +5,22 @@ import json
 import logging
 from typing import Dict, Any, List, Optional
 
+from utils.json_utils import LazyJSON, exact_loads, EMPTY_DICT
+
 logger = logging.getLogger(__name__)
 
 
 def convert_openai_tool_calls_to_anthropic(tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Convert OpenAI tool_calls to Anthropic tool_use content blocks."""
     logger.debug(f"[TOOL_CONVERSION] Converting {len(tool_calls)} OpenAI tool_calls to Anthropic format")
-    logger.debug(f"[TOOL_CONVERSION] Raw OpenAI tool_calls: {json.dumps(tool_calls, indent=2)}")
+    logger.debug("[TOOL_CONVERSION] Raw OpenAI tool_calls: %s", LazyJSON(tool_calls))
 
     anthropic_content = []
 
     for idx, tool_call in enumerate(tool_calls):
-        logger.debug(f"[TOOL_CONVERSION] Processing tool_call #{idx}: {json.dumps(tool_call, indent=2)}")
+        logger.debug("[TOOL_CONVERSION] Processing tool_call #%s: %s", idx, LazyJSON(tool_call))
 
-        function = tool_call.get("function", {})
+        function = tool_call.get("function", EMPTY_DICT)
         tool_id = tool_call.get("id", "")
         function_name = function.get("name", "")
         arguments_str = function.get("arguments", "{}")
@@ -28,8 +30,9 @@ def convert_openai_tool_calls_to_anthropic(tool_calls: List[Dict[str, Any]]) ->
         logger.debug(f"[TOOL_CONVERSION]   - Arguments (raw string): {arguments_str}")
 
         try:
-            parsed_input = json.loads(arguments_str)
-            logger.debug(f"[TOOL_CONVERSION]   - Parsed input: {json.dumps(parsed_input, indent=2)}")
+            # Client arguments may carry IDs beyond 64 bits; keep them exact
+            parsed_input = exact_loads(arguments_str)
+            logger.debug("[TOOL_CONVERSION]   - Parsed input: %s", LazyJSON(parsed_input))
         except json.JSONDecodeError as e:
             logger.error(f"[TOOL_CONVERSION]   - ERROR: Failed to parse arguments JSON: {e}")
             parsed_input = {}
@@ -41,10 +44,10 @@ def convert_openai_tool_calls_to_anthropic(tool_calls: List[Dict[str, Any]]) ->
             "input": parsed_input
         }
 
-        logger.debug(f"[TOOL_CONVERSION]   - Converted to Anthropic block: {json.dumps(anthropic_block, indent=2)}")
+        logger.debug("[TOOL_CONVERSION]   - Converted to Anthropic block: %s", LazyJSON(anthropic_block))
         anthropic_content.append(anthropic_block)
 
-    logger.debug(f"[TOOL_CONVERSION] Final Anthropic tool_use blocks: {json.dumps(anthropic_content, indent=2)}")
+    logger.debug("[TOOL_CONVERSION] Final Anthropic tool_use blocks: %s", LazyJSON(anthropic_content))
     return anthropic_content
 
 
@@ -54,7 +57,7 @@ def convert_openai_function_call_to_anthropic(function_call: Dict[str, Any]) ->
         "type": "tool_use",
         "id": f"func_{function_call.get('name', '')}",
         "name": function_call.get("name", ""),
-        "input": json.loads(function_call.get("arguments", "{}"))
+        "input": exact_loads(function_call.get("arguments", "{}"))
     }]
 
 
@@ -64,22 +67,27 @@ def convert_openai_tools_to_anthropic(openai_tools: Optional[List[Dict[str, Any]
         logger.debug("[TOOLS_SCHEMA] No tools to convert")
         return None
 
+    # Fast path: every tool is already in Anthropic format (Cursor sends this)
+    if all("name" in tool and "description" in tool and "type" not in tool for tool in openai_tools):
+        logger.debug("[TOOLS_SCHEMA] All %d tools already in Anthropic format, passing through", len(openai_tools))
+        return openai_tools
+
     logger.debug(f"[TOOLS_SCHEMA] Converting {len(openai_tools)} OpenAI tools to Anthropic format")
-    logger.debug(f"[TOOLS_SCHEMA] Raw OpenAI tools: {json.dumps(openai_tools, indent=2)}")
+    logger.debug("[TOOLS_SCHEMA] Raw OpenAI tools: %s", LazyJSON(openai_tools))
 
     anthropic_tools = []
 
     for idx, tool in enumerate(openai_tools):
-        logger.debug(f"[TOOLS_SCHEMA] Processing tool #{idx}: {json.dumps(tool, indent=2)}")
+        logger.debug("[TOOLS_SCHEMA] Processing tool #%s: %s", idx, LazyJSON(tool))
 
         # Check if it's already in Anthropic format (Cursor sends this)
         if "name" in tool and "description" in tool and "type" not in tool:
             # Already Anthropic format, pass through
-            logger.debug(f"[TOOLS_SCHEMA]   - Tool already in Anthropic format: {tool.get('name')}")
+            logger.debug("[TOOLS_SCHEMA]   - Tool already in Anthropic format: %s", tool.get("name"))
             anthropic_tools.append(tool)
         elif tool.get("type") == "function":
             # Standard OpenAI format
-            function = tool.get("function", {})
+            function = tool.get("function", EMPTY_DICT)
             tool_name = function.get("name", "")
             tool_description = function.get("description", "")
             tool_parameters = function.get("parameters", {})
@@ -87,7 +95,7 @@ def convert_openai_tools_to_anthropic(openai_tools: Optional[List[Dict[str, Any]
             logger.debug("[TOOLS_SCHEMA]   - Converting OpenAI function tool")
             logger.debug(f"[TOOLS_SCHEMA]     - Name: {tool_name}")
             logger.debug(f"[TOOLS_SCHEMA]     - Description: {tool_description}")
-            logger.debug(f"[TOOLS_SCHEMA]     - Parameters schema: {json.dumps(tool_parameters, indent=2)}")
+            logger.debug("[TOOLS_SCHEMA]     - Parameters schema: %s", LazyJSON(tool_parameters))
 
             anthropic_tool = {
                 "name": tool_name,
@@ -95,12 +103,12 @@ def convert_openai_tools_to_anthropic(openai_tools: Optional[List[Dict[str, Any]
                 "input_schema": tool_parameters
             }
 
-            logger.debug(f"[TOOLS_SCHEMA]   - Converted to Anthropic tool: {json.dumps(anthropic_tool, indent=2)}")
+            logger.debug("[TOOLS_SCHEMA]   - Converted to Anthropic tool: %s", LazyJSON(anthropic_tool))
             anthropic_tools.append(anthropic_tool)
         else:
             logger.warning(f"[TOOLS_SCHEMA]   - Unknown tool format (skipping): {json.dumps(tool, indent=2)}")
 
-    logger.debug(f"[TOOLS_SCHEMA] Final Anthropic tools: {json.dumps(anthropic_tools, indent=2)}")
+    logger.debug("[TOOLS_SCHEMA] Final Anthropic tools: %s", LazyJSON(anthropic_tools))
     return anthropic_tools if anthropic_tools else None
 
 
@@ -26,6 +26,7 @@ from chatgpt_oauth import (
 )
 from chatgpt_oauth.session import ensure_session_id
 from models import get_chatgpt_default_instructions, get_openai_model_id
+from utils.json_utils import LazyJSON, fast_dumps, fast_loads
 
 if TYPE_CHECKING:
     from stream_debug import StreamTracer
@@ -200,7 +201,7 @@ class ChatGPTProvider(BaseProvider):
         headers = self._get_headers(access_token, account_id, session_id, accept="application/json")
 
         logger.debug(f"[{request_id}] Making ChatGPT request to {self.endpoint}")
-        logger.debug(f"[{request_id}] Request payload: {json.dumps(payload, indent=2)}")
+        logger.debug("[%s] Request payload: %s", request_id, LazyJSON(payload))
 
         async with httpx.AsyncClient(timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)) as client:
             response = await client.post(
@@ -260,7 +261,7 @@ class ChatGPTProvider(BaseProvider):
             tracer.log_note(f"model={payload.get('model')}")
 
         logger.debug(f"[{request_id}] Streaming from ChatGPT: {self.endpoint}")
-        logger.debug(f"[{request_id}] Request payload: {json.dumps(payload, indent=2)}")
+        logger.debug("[%s] Request payload: %s", request_id, LazyJSON(payload))
 
         async with httpx.AsyncClient(timeout=httpx.Timeout(STREAM_TIMEOUT, connect=CONNECT_TIMEOUT, read=READ_TIMEOUT)) as client:
             try:
@@ -308,7 +309,7 @@ class ChatGPTProvider(BaseProvider):
                             continue
 
                         try:
-                            evt = json.loads(data)
+                            evt = fast_loads(data)
                         except json.JSONDecodeError:
                             continue
 
@@ -320,7 +321,7 @@ class ChatGPTProvider(BaseProvider):
                         openai_chunk = self._translate_response_event(evt, response_id, created, model)
 
                         if openai_chunk:
-                            chunk_str = f"data: {json.dumps(openai_chunk)}\n\n"
+                            chunk_str = f"data: {fast_dumps(openai_chunk)}\n\n"
                             if tracer:
                                 tracer.log_converted_chunk(chunk_str)
                             yield chunk_str
@@ -401,7 +402,7 @@ class ChatGPTProvider(BaseProvider):
                 args = item.get("arguments", "")
 
                 if isinstance(args, dict):
-                    args = json.dumps(args)
+                    args = fast_dumps(args)
 
                 return {
                     "id": response_id,
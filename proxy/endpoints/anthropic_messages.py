@@ -6,7 +6,7 @@ import logging
 import time
 import uuid
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from anthropic import (
     AnthropicMessageRequest,
@@ -21,6 +21,7 @@ from models.reasoning import REASONING_BUDGET_MAP
 from oauth import OAuthManager
 import settings
 from stream_debug import maybe_create_stream_tracer
+from utils.json_utils import LazyJSON, fast_loads
 from ..logging_utils import log_request
 
 logger = logging.getLogger(__name__)
@@ -85,10 +86,10 @@ async def anthropic_messages(request: AnthropicMessageRequest, raw_request: Requ
     anthropic_request = add_prompt_caching(anthropic_request)
 
     # Enforce thinking budget for reasoning models
-    if reasoning_level and reasoning_level in REASONING_BUDGET_MAP:
+    required_budget = REASONING_BUDGET_MAP.get(reasoning_level) if reasoning_level else None
+    if required_budget is not None:
         # Check if request already has thinking parameter
         existing_thinking = anthropic_request.get("thinking")
-        required_budget = REASONING_BUDGET_MAP[reasoning_level]
         
         if not existing_thinking or existing_thinking.get("type") != "enabled":
             # Add thinking parameter with appropriate budget
@@ -128,7 +129,7 @@ async def anthropic_messages(request: AnthropicMessageRequest, raw_request: Requ
         all_betas = required_betas
 
     logger.debug(f"[{request_id}] FINAL ANTHROPIC REQUEST HEADERS: authorization=Bearer *****, anthropic-beta={','.join(all_betas)}, User-Agent=Claude-Code/1.0.0")
-    logger.debug(f"[{request_id}] SYSTEM MESSAGE STRUCTURE: {json.dumps(anthropic_request.get('system', []), indent=2)}")
+    logger.debug("[%s] SYSTEM MESSAGE STRUCTURE: %s", request_id, LazyJSON(anthropic_request.get('system', [])))
     logger.debug(f"[{request_id}] FULL REQUEST COMPARISON - Our request structure:")
     logger.debug(f"[{request_id}] - model: {anthropic_request.get('model')}")
     system = anthropic_request.get('system')
@@ -139,7 +140,7 @@ async def anthropic_messages(request: AnthropicMessageRequest, raw_request: Requ
     logger.debug(f"[{request_id}] - messages: {len(anthropic_request.get('messages', []))} messages")
     logger.debug(f"[{request_id}] - stream: {anthropic_request.get('stream')}")
     logger.debug(f"[{request_id}] - temperature: {anthropic_request.get('temperature')}")
-    logger.debug(f"[{request_id}] FULL REQUEST BODY: {json.dumps(anthropic_request, indent=2)}")
+    logger.debug("[%s] FULL REQUEST BODY: %s", request_id, LazyJSON(anthropic_request))
 
     try:
         if request.stream:
@@ -192,19 +193,20 @@ async def anthropic_messages(request: AnthropicMessageRequest, raw_request: Requ
                 # FastAPI will automatically set the status code and return this as JSON
                 raise HTTPException(status_code=response.status_code, detail=error_json)
 
-            # Return Anthropic response as-is (native format)
-            anthropic_response = response.json()
+            # Return Anthropic response as-is (native format): the upstream body
+            # is forwarded byte for byte instead of being parsed and re-encoded
             final_elapsed_ms = int((time.time() - start_time) * 1000)
 
             # Log usage information for debugging
-            usage_info = anthropic_response.get("usage", {})
-            input_tokens = usage_info.get("input_tokens", 0)
-            output_tokens = usage_info.get("output_tokens", 0)
-            total_tokens = input_tokens + output_tokens
-            logger.debug(f"[{request_id}] [DEBUG] Response usage: input={input_tokens}, output={output_tokens}, total={total_tokens}")
+            if logger.isEnabledFor(logging.DEBUG):
+                usage_info = fast_loads(response.content).get("usage", {})
+                input_tokens = usage_info.get("input_tokens", 0)
+                output_tokens = usage_info.get("output_tokens", 0)
+                total_tokens = input_tokens + output_tokens
+                logger.debug(f"[{request_id}] [DEBUG] Response usage: input={input_tokens}, output={output_tokens}, total={total_tokens}")
 
             logger.info(f"[{request_id}] ===== ANTHROPIC MESSAGES FINISHED ===== Total time: {final_elapsed_ms}ms")
-            return anthropic_response
+            return Response(content=response.content, media_type="application/json")
 
     except HTTPException:
         final_elapsed_ms = int((time.time() - start_time) * 1000)
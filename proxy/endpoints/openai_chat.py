@@ -7,7 +7,7 @@ import time
 import uuid
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from oauth import OAuthManager
 from models import is_custom_model, is_chatgpt_model, get_custom_model_config
@@ -15,6 +15,7 @@ from chatgpt_oauth import ChatGPTOAuthManager
 from providers.chatgpt_provider import ChatGPTProvider
 import settings
 from stream_debug import maybe_create_stream_tracer
+from utils.json_utils import LazyJSON, exact_loads, fast_dumps_bytes
 from anthropic import make_anthropic_request
 from openai_compat import convert_anthropic_response_to_openai
 from ..models import OpenAIChatCompletionRequest
@@ -43,54 +44,56 @@ async def openai_chat_completions(request: OpenAIChatCompletionRequest, raw_requ
 
     # Log the raw request data with full detail
     request_dict = request.model_dump()
-    logger.debug(f"[{request_id}] ===== RAW CLIENT REQUEST (FULL DETAIL) =====")
-    logger.debug(f"[{request_id}] Model: {request_dict.get('model')}")
-    logger.debug(f"[{request_id}] Stream: {request_dict.get('stream')}")
-    logger.debug(f"[{request_id}] Max tokens: {request_dict.get('max_tokens')}")
-    logger.debug(f"[{request_id}] Temperature: {request_dict.get('temperature')}")
-
-    # Log messages in detail
-    messages = request_dict.get('messages', [])
-    logger.debug(f"[{request_id}] Messages ({len(messages)} total):")
-    for idx, msg in enumerate(messages):
-        logger.debug(f"[{request_id}]   Message #{idx}: role={msg.get('role')}, content_type={type(msg.get('content'))}")
-        if isinstance(msg.get('content'), str):
-            content_preview = msg.get('content', '')[:200]
-            logger.debug(f"[{request_id}]     Content (preview): {content_preview}...")
-        elif isinstance(msg.get('content'), list):
-            logger.debug(f"[{request_id}]     Content (array with {len(msg.get('content', []))} items): {json.dumps(msg.get('content'), indent=2)}")
-
-        # Log tool_calls if present
-        if 'tool_calls' in msg:
-            logger.debug(f"[{request_id}]     Tool calls: {json.dumps(msg['tool_calls'], indent=2)}")
-
-        # Log tool_call_id if present (for tool result messages)
-        if 'tool_call_id' in msg:
-            logger.debug(f"[{request_id}]     Tool call ID: {msg['tool_call_id']}")
-
-    # Log tools in detail
-    if 'tools' in request_dict and request_dict['tools']:
-        logger.debug(f"[{request_id}] Tools ({len(request_dict['tools'])} total):")
-        for idx, tool in enumerate(request_dict['tools']):
-            logger.debug(f"[{request_id}]   Tool #{idx}: {json.dumps(tool, indent=2)}")
-    else:
-        logger.debug(f"[{request_id}] No tools in request")
+    # The detailed dump walks every message and tool; skip it unless DEBUG is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"[{request_id}] ===== RAW CLIENT REQUEST (FULL DETAIL) =====")
+        logger.debug(f"[{request_id}] Model: {request_dict.get('model')}")
+        logger.debug(f"[{request_id}] Stream: {request_dict.get('stream')}")
+        logger.debug(f"[{request_id}] Max tokens: {request_dict.get('max_tokens')}")
+        logger.debug(f"[{request_id}] Temperature: {request_dict.get('temperature')}")
+
+        # Log messages in detail
+        messages = request_dict.get('messages', [])
+        logger.debug(f"[{request_id}] Messages ({len(messages)} total):")
+        for idx, msg in enumerate(messages):
+            logger.debug(f"[{request_id}]   Message #{idx}: role={msg.get('role')}, content_type={type(msg.get('content'))}")
+            if isinstance(msg.get('content'), str):
+                content_preview = msg.get('content', '')[:200]
+                logger.debug(f"[{request_id}]     Content (preview): {content_preview}...")
+            elif isinstance(msg.get('content'), list):
+                logger.debug("[%s]     Content (array with %s items): %s", request_id, len(msg.get('content', [])), LazyJSON(msg.get('content')))
+
+            # Log tool_calls if present
+            if 'tool_calls' in msg:
+                logger.debug("[%s]     Tool calls: %s", request_id, LazyJSON(msg['tool_calls']))
+
+            # Log tool_call_id if present (for tool result messages)
+            if 'tool_call_id' in msg:
+                logger.debug(f"[{request_id}]     Tool call ID: {msg['tool_call_id']}")
+
+        # Log tools in detail
+        if 'tools' in request_dict and request_dict['tools']:
+            logger.debug(f"[{request_id}] Tools ({len(request_dict['tools'])} total):")
+            for idx, tool in enumerate(request_dict['tools']):
+                logger.debug("[%s]   Tool #%s: %s", request_id, idx, LazyJSON(tool))
+        else:
+            logger.debug(f"[{request_id}] No tools in request")
 
-    # Log tool_choice if present
-    if 'tool_choice' in request_dict:
-        logger.debug(f"[{request_id}] Tool choice: {json.dumps(request_dict['tool_choice'], indent=2)}")
+        # Log tool_choice if present
+        if 'tool_choice' in request_dict:
+            logger.debug("[%s] Tool choice: %s", request_id, LazyJSON(request_dict['tool_choice']))
 
-    # Log full request as JSON for complete reference
-    logger.debug(f"[{request_id}] Full request JSON: {json.dumps(request_dict, indent=2)}")
-    logger.debug(f"[{request_id}] ===== END RAW CLIENT REQUEST =====")
+        # Log full request as JSON for complete reference
+        logger.debug("[%s] Full request JSON: %s", request_id, LazyJSON(request_dict))
+        logger.debug(f"[{request_id}] ===== END RAW CLIENT REQUEST =====")
 
-    logger.debug(f"[{request_id}] OpenAI Request: {request.model_dump()}")
+        logger.debug(f"[{request_id}] OpenAI Request: {request_dict}")
 
     # Log HTTP headers to see if client is sending anthropic-beta
     headers_dict = dict(raw_request.headers)
     if "anthropic-beta" in headers_dict:
         logger.warning(f"[{request_id}] Client sent anthropic-beta header: {headers_dict['anthropic-beta']}")
-    logger.debug(f"[{request_id}] All HTTP headers from client: {dict(raw_request.headers)}")
+    logger.debug("[%s] All HTTP headers from client: %s", request_id, headers_dict)
 
     # Log model routing decision
     is_custom = is_custom_model(request.model)
@@ -310,7 +313,7 @@ async def openai_chat_completions(request: OpenAIChatCompletionRequest, raw_requ
             is_native_anthropic=False
         )
 
-        logger.debug(f"[{request_id}] Final Anthropic request (after adding prompt caching): {json.dumps(anthropic_request, indent=2)}")
+        logger.debug("[%s] Final Anthropic request (after adding prompt caching): %s", request_id, LazyJSON(anthropic_request))
 
         # Extract client beta headers
         client_beta_headers = headers_dict.get("anthropic-beta")
@@ -381,7 +384,8 @@ async def openai_chat_completions(request: OpenAIChatCompletionRequest, raw_requ
                 raise HTTPException(status_code=response.status_code, detail=openai_error)
 
             # Convert Anthropic response to OpenAI format
-            anthropic_response = response.json()
+            # exact_loads: tool_use inputs may hold integers beyond 64 bits
+            anthropic_response = exact_loads(response.content)
             openai_response = convert_anthropic_response_to_openai(anthropic_response, request.model)
 
             final_elapsed_ms = int((time.time() - start_time) * 1000)
@@ -394,7 +398,9 @@ async def openai_chat_completions(request: OpenAIChatCompletionRequest, raw_requ
             logger.debug(f"[{request_id}] [DEBUG] Response usage: prompt={prompt_tokens}, completion={completion_tokens}, total={total_tokens}")
 
             logger.info(f"[{request_id}] ===== OPENAI CHAT COMPLETION FINISHED ===== Total time: {final_elapsed_ms}ms")
-            return openai_response
+            # Serialize directly; returning the dict would run it through
+            # jsonable_encoder and stdlib json
+            return Response(content=fast_dumps_bytes(openai_response), media_type="application/json")
 
     except HTTPException:
         final_elapsed_ms = int((time.time() - start_time) * 1000)
@@ -61,7 +61,7 @@ async def create_openai_stream(
         tracer: Optional stream tracer for debugging
 
     Yields:
-        SSE chunks in OpenAI format
+        SSE chunks in OpenAI format, as UTF-8 bytes
     """
     # Get Anthropic stream
     anthropic_stream = stream_anthropic_response(
@@ -37,6 +37,9 @@ STREAM_TRACE_ENABLED = config.get("STREAM_TRACE_ENABLED", False)
 STREAM_TRACE_DIR = config.get("STREAM_TRACE_DIR", "stream_traces")
 STREAM_TRACE_MAX_BYTES = config.get("STREAM_TRACE_MAX_BYTES", 262144)
 
+# Stream conversion: merge consecutive text deltas from one upstream read into a single OpenAI chunk
+STREAM_COALESCE = config.get("STREAM_COALESCE", True)
+
 # OAuth configuration (hardcoded - not user configurable)
 # Max/Pro OAuth: claude.ai for authorization, console.anthropic.com for token exchange
 # Uses Bearer tokens (not API keys) for authentication
@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 
 class StreamTracer:
@@ -33,12 +33,16 @@ class StreamTracer:
 
         self.log_note("stream tracer initialized")
 
-    def log_source_chunk(self, chunk: str) -> None:
+    def log_source_chunk(self, chunk: Union[str, bytes]) -> None:
         """Record a raw Anthropic SSE chunk."""
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8", "replace")
         self._write("ANTHROPIC", chunk)
 
-    def log_converted_chunk(self, chunk: str) -> None:
+    def log_converted_chunk(self, chunk: Union[str, bytes]) -> None:
         """Record the chunk returned to the OpenAI client."""
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8", "replace")
         self._write("OPENAI", chunk)
 
     def log_note(self, note: str) -> None:
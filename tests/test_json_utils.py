@@ -0,0 +1,36 @@
+"""Tests for the fast JSON helpers."""
+import json
+
+import pytest
+
+from utils.json_utils import compact_dumps, exact_loads, fast_dumps, fast_dumps_bytes
+
+BIG_INT = 2 ** 70
+
+
+def test_fast_dumps_matches_compact_dumps():
+    obj = {"text": "héllo", "items": [1, 2.5, None, True]}
+    assert fast_dumps(obj) == compact_dumps(obj)
+    assert fast_dumps_bytes(obj) == compact_dumps(obj).encode("utf-8")
+
+
+def test_fast_dumps_falls_back_for_integers_beyond_64_bits():
+    obj = [{"n": BIG_INT}]
+    assert json.loads(fast_dumps(obj)) == obj
+    assert json.loads(fast_dumps_bytes(obj)) == obj
+
+
+def test_exact_loads_keeps_integers_beyond_64_bits():
+    text = '{"id": 98765432109876543210, "neg": -9223372036854775809, "small": 42}'
+    expected = {"id": 98765432109876543210, "neg": -9223372036854775809, "small": 42}
+
+    assert exact_loads(text) == expected
+    assert exact_loads(text.encode("utf-8")) == expected
+    assert isinstance(exact_loads(text)["id"], int)
+
+
+def test_exact_loads_matches_stdlib_on_edge_cases():
+    for text in ('{"a": 1.5, "b": "x"}', "NaN", "[1e400]"):
+        assert repr(exact_loads(text)) == repr(json.loads(text))
+    with pytest.raises(json.JSONDecodeError):
+        exact_loads("{bad")
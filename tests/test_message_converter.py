@@ -0,0 +1,28 @@
+"""Tests for OpenAI -> Anthropic message conversion."""
+import json
+
+from openai_compat.content_converter import convert_openai_content_to_anthropic
+from openai_compat.message_converter import convert_openai_messages_to_anthropic
+
+BIG_INT = 2 ** 70
+
+
+def test_tool_message_with_big_integer_content():
+    messages = [
+        {"role": "user", "content": "hi"},
+        {"role": "tool", "tool_call_id": "call_1", "content": [{"n": BIG_INT}]},
+    ]
+
+    anthropic_messages, _ = convert_openai_messages_to_anthropic(messages)
+
+    tool_result = anthropic_messages[0]["content"][-1]
+    assert tool_result["type"] == "tool_result"
+    assert json.loads(tool_result["content"]) == [{"n": BIG_INT}]
+
+
+def test_tool_result_item_with_big_integer_parts():
+    content = [{"type": "tool_result", "tool_use_id": "call_1", "content": [{"n": BIG_INT}]}]
+
+    blocks = convert_openai_content_to_anthropic(content)
+
+    assert json.loads(blocks[0]["content"]) == {"n": BIG_INT}
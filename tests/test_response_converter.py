@@ -0,0 +1,23 @@
+"""Tests for Anthropic -> OpenAI response conversion."""
+import json
+
+from openai_compat.response_converter import convert_anthropic_response_to_openai
+from utils.json_utils import exact_loads
+
+BIG_ID = 98765432109876543210
+
+
+def test_tool_use_input_keeps_big_integers_exact():
+    # Raw upstream body, parsed the way the non-streaming endpoint does
+    body = (
+        b'{"id":"msg_1","type":"message","role":"assistant","stop_reason":"tool_use",'
+        b'"content":[{"type":"tool_use","id":"toolu_1","name":"lookup","input":{"id":'
+        + str(BIG_ID).encode("ascii")
+        + b'}}],"usage":{"input_tokens":3,"output_tokens":5}}'
+    )
+
+    response = convert_anthropic_response_to_openai(exact_loads(body), "claude")
+
+    tool_call = response["choices"][0]["message"]["tool_calls"][0]
+    assert str(BIG_ID) in tool_call["function"]["arguments"]
+    assert json.loads(tool_call["function"]["arguments"]) == {"id": BIG_ID}
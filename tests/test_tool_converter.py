@@ -0,0 +1,35 @@
+"""Tests for OpenAI -> Anthropic tool call conversion."""
+from openai_compat.tool_converter import (
+    convert_openai_function_call_to_anthropic,
+    convert_openai_tool_calls_to_anthropic,
+)
+
+BIG_ID = 98765432109876543210
+
+
+def test_tool_call_arguments_keep_big_integers_exact():
+    tool_calls = [{
+        "id": "call_1",
+        "type": "function",
+        "function": {"name": "lookup", "arguments": '{"id": %d}' % BIG_ID},
+    }]
+
+    blocks = convert_openai_tool_calls_to_anthropic(tool_calls)
+
+    assert blocks[0]["input"] == {"id": BIG_ID}
+    assert isinstance(blocks[0]["input"]["id"], int)
+
+
+def test_function_call_arguments_keep_big_integers_exact():
+    function_call = {"name": "lookup", "arguments": '{"id": %d}' % BIG_ID}
+
+    blocks = convert_openai_function_call_to_anthropic(function_call)
+
+    assert blocks[0]["input"] == {"id": BIG_ID}
+    assert isinstance(blocks[0]["input"]["id"], int)
+
+
+def test_invalid_tool_call_arguments_become_empty_input():
+    tool_calls = [{"id": "call_1", "function": {"name": "lookup", "arguments": "{bad"}}]
+
+    assert convert_openai_tool_calls_to_anthropic(tool_calls)[0]["input"] == {}
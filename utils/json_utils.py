@@ -0,0 +1,84 @@
+"""
+JSON helpers for hot conversion paths.
+
+orjson is used when installed; otherwise the stdlib json module is used with
+equivalent compact, non-ASCII-escaping settings.
+"""
+
+import functools
+import json
+import re
+from typing import Any, Dict
+
+# Shared read-only default for .get() lookups on parsed JSON; never mutate or
+# return it (values that end up in an outgoing payload need a fresh dict)
+EMPTY_DICT: Dict[str, Any] = {}
+
+# Compact, non-ASCII-escaping JSON for payloads sent over the wire
+compact_dumps = functools.partial(json.dumps, ensure_ascii=False, separators=(",", ":"))
+
+try:
+    import orjson
+
+    # orjson rejects some values the stdlib accepts (integers beyond 64 bits,
+    # non-str dict keys) with a TypeError; those fall back to compact_dumps
+
+    def fast_dumps(obj: Any) -> str:
+        """Serialize to compact JSON text (orjson, stdlib fallback)."""
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            return compact_dumps(obj)
+
+    def fast_dumps_bytes(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes, for frames written straight to the socket."""
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return compact_dumps(obj).encode("utf-8")
+
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    fast_loads = orjson.loads
+
+    # orjson silently parses integers beyond 64 bits as floats. Any number
+    # that long has at least 19 digits in a row, so only such payloads need
+    # the stdlib parser to keep their exact value.
+    _LONG_DIGIT_RUN = re.compile(r"\d{19}")
+    _LONG_DIGIT_RUN_BYTES = re.compile(rb"\d{19}")
+
+    def exact_loads(data: Any) -> Any:
+        """Parse JSON keeping integers exact; orjson unless that could lose precision."""
+        pattern = _LONG_DIGIT_RUN_BYTES if isinstance(data, (bytes, bytearray)) else _LONG_DIGIT_RUN
+        if pattern.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except ValueError:
+                # Let the stdlib decide (it also accepts NaN/Infinity and huge
+                # exponents) and raise its own error for invalid input
+                pass
+        return json.loads(data)
+except ImportError:
+    fast_dumps = compact_dumps
+    fast_loads = json.loads
+    exact_loads = json.loads
+
+    def fast_dumps_bytes(obj: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes (stdlib)."""
+        return compact_dumps(obj).encode("utf-8")
+
+
+class LazyJSON:
+    """
+    Log argument that pretty-prints its object only when the record is emitted.
+
+    Pass it as a %-style argument (``logger.debug("body: %s", LazyJSON(body))``)
+    so disabled debug logging never serializes large request payloads.
+    """
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj, indent=2)
@@ -2,7 +2,7 @@ import json
 import os
 import platform
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import time
 
 from settings import TOKEN_FILE
@@ -158,6 +158,22 @@ class TokenStorage:
 
         return tokens.get("refresh_token")
 
+    def get_refresh_and_status(self) -> Tuple[Optional[str], bool]:
+        """Get the refresh token and long-term flag from a single file read
+
+        Returns:
+            Tuple of (refresh_token, is_long_term); refresh_token is None for
+            long-term tokens or when no tokens are stored
+        """
+        tokens = self.load_tokens()
+        if not tokens:
+            return None, False
+
+        if tokens.get("token_type") == "long_term":
+            return None, True
+
+        return tokens.get("refresh_token"), False
+
     def get_status(self) -> Dict[str, Any]:
         """Get token status without exposing secrets (plan.md section 4.4)"""
         tokens = self.load_tokens()
@@ -11,7 +11,7 @@ Entries are short‑lived and capped to avoid unbounded growth.
 from __future__ import annotations
 
 import time
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 
 class _ThinkingCache:
@@ -22,8 +22,13 @@ class _ThinkingCache:
 
     def put(self, tool_use_id: str, thinking_block: dict) -> None:
         """Store a signed thinking block for a given tool_use id."""
-        if not tool_use_id:
-            return
+        self.put_many((tool_use_id,), thinking_block)
+
+    def put_many(self, tool_use_ids: Iterable[str], thinking_block: dict) -> None:
+        """Store one signed thinking block under several tool_use ids.
+
+        The block is validated and the cache swept once for the whole batch.
+        """
         # Require the fields Anthropic expects on input
         if not isinstance(thinking_block, dict):
             return
@@ -33,10 +38,19 @@ class _ThinkingCache:
         if not isinstance(sig, str) or not sig.strip():
             return
 
-        now = time.time()
-        self._data[tool_use_id] = (thinking_block, now)
-        self._evict_if_needed()
-        self._cleanup()
+        entry = (thinking_block, time.time())
+        stored = False
+        for tool_use_id in tool_use_ids:
+            if tool_use_id:
+                self._data[tool_use_id] = entry
+                stored = True
+        if stored:
+            self._evict_if_needed()
+            self._cleanup()
+
+    def __len__(self) -> int:
+        """Number of stored entries, including any not yet swept as expired."""
+        return len(self._data)
 
     def get(self, tool_use_id: str) -> Optional[dict]:
         """Retrieve a valid, non‑expired thinking block for the tool_use id."""